@@ -0,0 +1,289 @@
+import argparse
+import functools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import test5
+
+try:
+    import resource  # Windows에는 없음
+except ImportError:
+    resource = None
+
+# 비식별화 방법별 성능 측정 (test5.py의 컬럼 단위 함수, 전체 파이프라인, 병합)
+DEFAULT_SIZES = [10000, 1000000, 10000000]
+DEFAULT_SEED = 2024
+BENCHMARK_SECRET = 'benchmark-secret'
+DEFAULT_WARMUP = 1  # 측정 전에 버리는 실행 횟수 (캐시, 프로세스 풀 기동 등)
+DEFAULT_REPEATS = 5  # 항목마다 측정하는 최소 실행 횟수 (중앙값과 가장 빠른 실행을 기록)
+MIN_MEASURE_SECONDS = 1.0  # 짧은 측정은 이 시간이 찰 때까지 더 반복한다 (작은 데이터에서 잡음을 줄이기 위함)
+MAX_REPEATS = 100
+
+SURNAMES = ['김', '이', '박', '최', '정', '강', '조', '윤', '장', '임', '남궁', '황보', '제갈']
+GIVEN_SYLLABLES = ['민', '서', '지', '현', '준', '우', '예', '하', '도', '윤', '수', '영', '진', '은']
+CITIES = ['서울특별시', '부산광역시', '대구광역시', '인천광역시', '광주광역시', '대전광역시', '경기도', '제주특별자치도']
+DISTRICTS = ['강남구', '중구', '해운대구', '수성구', '남동구', '북구', '유성구', '수원시', '제주시']
+STREETS = ['테헤란로', '중앙대로', '해운대로', '달구벌대로', '구월로', '무등로', '대학로', '정조로', '연북로']
+
+# 비식별화 방법 -> 측정에 사용할 합성 데이터 컬럼
+METHOD_COLUMNS = {
+    "Replace with **": '이름',
+    "Replace with ***": '이름',
+    "SHA-256 Encrypt": '고객번호',
+    "HMAC-SHA256": '고객번호',
+    "BLAKE2b Keyed": '고객번호',
+    "Mask Phone": '전화번호',
+    "Categorize Age": '생년월일',
+    "Mask Address": '주소',
+    "Round Up Square Footage": '면적',
+    "Round Up Monthly Payment": '월납입금',
+}
+
+# 전체 파이프라인에서 사용하는 설정 (컬럼마다 방법 하나)
+PIPELINE_SETTINGS = {
+    '이름': "Replace with **",
+    '고객번호': "SHA-256 Encrypt",
+    '전화번호': "Mask Phone",
+    '생년월일': "Categorize Age",
+    '주소': "Mask Address",
+    '면적': "Round Up Square Footage",
+    '월납입금': "Round Up Monthly Payment",
+}
+
+
+def generate_dataset(rows, seed=DEFAULT_SEED):
+    """한국 개인정보 형태의 합성 데이터를 만드는 함수 (같은 seed면 항상 같은 데이터)"""
+    rng = np.random.default_rng(seed)
+    surnames = np.array(SURNAMES, dtype=object)[rng.integers(0, len(SURNAMES), rows)]
+    given = np.array(GIVEN_SYLLABLES, dtype=object)
+    # 이름 글자 수가 섞이도록 외자 이름을 일부 포함
+    names = surnames + given[rng.integers(0, len(given), rows)]
+    two_syllables = rng.random(rows) < 0.85
+    names[two_syllables] += given[rng.integers(0, len(given), two_syllables.sum())]
+
+    addresses = (np.array(CITIES, dtype=object)[rng.integers(0, len(CITIES), rows)] + ' '
+                 + np.array(DISTRICTS, dtype=object)[rng.integers(0, len(DISTRICTS), rows)] + ' '
+                 + np.array(STREETS, dtype=object)[rng.integers(0, len(STREETS), rows)] + ' '
+                 + rng.integers(1, 500, rows).astype(str).astype(object))
+
+    birthdates = pd.Timestamp('1950-01-01') + pd.to_timedelta(rng.integers(0, 365 * 55, rows), unit='D')
+    return pd.DataFrame({
+        '고객번호': np.char.add('C', np.char.zfill(np.arange(rows).astype(str), 9)).astype(object),
+        '이름': names,
+        # CSV로 읽으면 앞자리 0이 빠진 숫자가 되는 실제 입력과 같게 둔다
+        '전화번호': 1000000000 + rng.integers(0, 100000000, rows),
+        '주소': addresses,
+        '생년월일': birthdates.strftime('%Y-%m-%d').astype(object),
+        '면적': rng.integers(200, 5000, rows).astype(float),
+        '월납입금': rng.integers(100000, 5000000, rows).astype(float),
+    })
+
+
+def _timed_run(func):
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start, time.process_time() - cpu_start
+
+
+def measure_cases(cases, rows, track_memory=True, warmup=DEFAULT_WARMUP, repeats=DEFAULT_REPEATS):
+    """(이름, func) 목록을 번갈아 실행해 걸린 시간과 최대 메모리 사용량을 기록한 결과 목록을 반환하는 함수
+
+    모두 warmup번씩 실행해 버린 뒤, 한 바퀴에 하나씩 번갈아 실행하는 것을 각각 repeats번 이상,
+    합이 MIN_MEASURE_SECONDS 이상(최대 MAX_REPEATS번)이 될 때까지 반복하고 중앙값(seconds)과
+    가장 빠른 시간(best_seconds)을 기록한다. 같은 코드도 한 번만 재면 수십 % 차이가 나고, 머신 속도가
+    몇 초 단위로 바뀌기도 하므로 한 항목을 연달아 재지 않고 전체 측정 시간에 고르게 나눠 잰다.
+    tracemalloc은 실행 속도를 크게 떨어뜨리므로 메모리는 마지막에 따로 한 번씩 잰다.
+    """
+    for _, func in cases:
+        for _ in range(warmup):
+            func()
+    times = [[] for _ in cases]
+    cpu_times = [[] for _ in cases]
+    while True:
+        pending = [i for i in range(len(cases))
+                   if len(times[i]) < max(1, repeats)
+                   or (sum(times[i]) < MIN_MEASURE_SECONDS and len(times[i]) < MAX_REPEATS)]
+        if not pending:
+            break
+        for i in pending:
+            seconds, cpu_seconds = _timed_run(cases[i][1])
+            times[i].append(seconds)
+            cpu_times[i].append(cpu_seconds)
+
+    results = []
+    for (name, func), case_times, case_cpu_times in zip(cases, times, cpu_times):
+        seconds, best = statistics.median(case_times), min(case_times)
+        peak = None
+        if track_memory:
+            tracemalloc.start()
+            try:
+                func()
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        result = {
+            'benchmark': name,
+            'rows': rows,
+            'runs': len(case_times),
+            'seconds': round(seconds, 4),
+            'best_seconds': round(best, 4),
+            'cpu_seconds': round(statistics.median(case_cpu_times), 4),
+            'rows_per_sec': round(rows / seconds) if seconds else None,
+            'best_rows_per_sec': round(rows / best) if best else None,
+            'peak_memory_bytes': peak,
+        }
+        print(f"{name:<40} {rows:>10,} rows {seconds:>9.3f}s {result['rows_per_sec'] or 0:>12,} rows/s "
+              f"(best {result['best_rows_per_sec'] or 0:>12,}, {len(case_times)} runs)"
+              + (f" {peak / 1024 ** 2:>9.1f} MB" if peak is not None else ""), flush=True)
+        results.append(result)
+    return results
+
+
+def run_benchmarks(sizes, seed=DEFAULT_SEED, methods=None, track_memory=True, workdir=None,
+                   warmup=DEFAULT_WARMUP, repeats=DEFAULT_REPEATS):
+    """크기별로 합성 데이터를 만들고 방법별, 파이프라인, 병합 성능을 측정한 결과 목록을 반환하는 함수"""
+    methods = methods or list(METHOD_COLUMNS)
+    results = []
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for rows in sizes:
+            df = generate_dataset(rows, seed)
+            options = test5.new_job_options(secret=BENCHMARK_SECRET)
+            cases = []
+
+            # 비식별화 방법별 (컬럼 하나)
+            for method in methods:
+                column_func = test5.ANONYMIZATION_METHODS[method]
+                series = df[METHOD_COLUMNS[method]]
+                cases.append((f"method:{method}", functools.partial(column_func, series, options)))
+
+            # 전체 파이프라인: 메모리 처리(읽기 -> 비식별화 -> 쓰기)와 청크 단위 처리
+            source = os.path.join(tmp, f'source_{rows}.csv')
+            df.to_csv(source, index=False)
+            output = os.path.join(tmp, f'anonymized_{rows}.csv')
+
+            def in_memory_pipeline():
+                loaded = test5.read_table(source)
+                test5.write_table(test5.anonymize_dataframe(loaded, PIPELINE_SETTINGS, options), output)
+
+            cases.append(("pipeline:in-memory", in_memory_pipeline))
+            cases.append(("pipeline:streaming",
+                          lambda: test5.anonymize_csv_file(source, output, PIPELINE_SETTINGS, options=options)))
+
+            # 병합: 고객번호 기준으로 나눈 두 파일을 다시 합친다
+            left_path = os.path.join(tmp, f'left_{rows}.csv')
+            right_path = os.path.join(tmp, f'right_{rows}.csv')
+            df[['고객번호', '이름', '전화번호', '주소']].to_csv(left_path, index=False)
+            df[['고객번호', '생년월일', '면적', '월납입금']].sample(frac=1, random_state=seed).to_csv(
+                right_path, index=False)
+            merged = os.path.join(tmp, f'merged_{rows}.csv')
+
+            def in_memory_merge():
+                merged_df = test5.merge_dataframes(test5.read_table(left_path), test5.read_table(right_path), '고객번호')
+                test5.write_table(merged_df, merged, 'utf-8-sig')
+
+            cases.append(("merge:in-memory", in_memory_merge))
+            cases.append(("merge:out-of-core",
+                          lambda: test5.merge_csv_files(left_path, right_path, '고객번호', merged)))
+            results.extend(measure_cases(cases, rows, track_memory, warmup, repeats))
+            del df
+    return results
+
+
+def environment_info():
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'hash_workers': test5.HASH_WORKERS,
+    }
+
+
+def compare_results(results, baseline, tolerance, statistic='median'):
+    """기준 결과보다 rows/s가 tolerance 비율 이상 떨어진 항목을 (결과, 기준, 변화율, 결과 rows/s, 기준 rows/s)로 반환하는 함수
+
+    statistic이 'best'면 가장 빠른 실행, 'median'이면 중앙값의 rows/s를 비교한다
+    (반복 측정 전의 기준 파일에는 한 번 잰 rows_per_sec만 있으므로 그 값을 쓴다).
+    """
+    field = 'best_rows_per_sec' if statistic == 'best' else 'rows_per_sec'
+    previous = {(r['benchmark'], r['rows']): r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        before = previous.get((result['benchmark'], result['rows']))
+        if not before:
+            continue
+        before_rate = before.get(field) or before['rows_per_sec']
+        rate = result.get(field)
+        if before_rate and rate is not None:
+            change = rate / before_rate - 1
+            if change < -tolerance:
+                regressions.append((result, before, change, rate, before_rate))
+    return regressions
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Benchmark anonymization methods, the pipeline and merges")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="dataset sizes in rows")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="random seed for the synthetic data")
+    parser.add_argument('--method', action='append', choices=list(METHOD_COLUMNS),
+                        help="benchmark only this method (repeatable, default: all)")
+    parser.add_argument('--workers', type=int, default=test5.HASH_WORKERS, help="processes used for hashing")
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP,
+                        help=f"untimed runs before measuring (default: {DEFAULT_WARMUP})")
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS,
+                        help=f"timed runs per benchmark (default: {DEFAULT_REPEATS})")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="skip the extra traced run that measures peak memory")
+    parser.add_argument('--workdir', help="directory for temporary CSV files (default: system temp)")
+    parser.add_argument('-o', '--output', default='benchmark_results.json', help="JSON file to write results to")
+    parser.add_argument('--baseline', help="previous results JSON; exit with status 1 on a regression")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="allowed slowdown in rows/s against the baseline (default: 0.2 = 20%%)")
+    parser.add_argument('--compare', choices=['median', 'best'], default='median',
+                        help="compare the median or the fastest run against the baseline (default: median)")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    test5.set_hash_workers(args.workers)
+    results = run_benchmarks(args.sizes, args.seed, args.method, not args.no_memory, args.workdir,
+                             args.warmup, args.repeats)
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'seed': args.seed,
+        'warmup': args.warmup,
+        'repeats': args.repeats,
+        'environment': environment_info(),
+        # 프로세스 전체의 최대 RSS (KB, Linux 기준)
+        'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None,
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    print(f"results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            regressions = compare_results(results, json.load(file), args.tolerance, args.compare)
+        for result, before, change, rate, before_rate in regressions:
+            print(f"REGRESSION {result['benchmark']} ({result['rows']:,} rows): "
+                  f"{before_rate:,} -> {rate:,} rows/s ({change:+.0%}, {args.compare})")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
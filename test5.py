@@ -2,50 +2,508 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 import tkinter.ttk as ttk
 import pandas as pd
+import argparse
+import base64
+import bz2
+import codecs
+import collections
+import contextlib
+import datetime
+import gzip
+import functools
+import glob
 import hashlib
+import hmac
+import json
+import lzma
+import os
+import pickle
+import queue
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import numpy as np
 import chardet  # 인코딩 감지를 위해 추가
 
+try:
+    import resource  # 최대 메모리(RSS) 측정용, Windows에는 없음
+except ImportError:
+    resource = None
+
 
 # 전역 변수
 df1 = None
 df2 = None
-df_to_anonymize = None
+file_path1 = None
+file_path2 = None
+df_to_anonymize = None  # 비식별화할 파일의 미리보기 (헤더 + 앞부분 행)
+anonymize_file_path = None
 anonymization_settings = {}
 anonymized_columns = []
 
 
-def detect_encoding(file_path):
-    """파일의 인코딩을 자동으로 감지하여 반환하는 함수"""
-    with open(file_path, 'rb') as file:
-        result = chardet.detect(file.read())
-    return result['encoding']
+# 입력 파일 형식 (압축 CSV, Parquet, Feather)
+INPUT_FORMATS = {'.parquet': 'parquet', '.pq': 'parquet', '.feather': 'feather', '.arrow': 'feather', '.ipc': 'feather'}
+OPEN_FILETYPES = [
+    ("Data files", "*.csv *.gz *.bz2 *.xz *.zst *.zip *.parquet *.pq *.feather *.arrow"),
+    ("CSV files", "*.csv"), ("All files", "*.*")]
+
+
+def input_format(file_path):
+    """입력 파일 형식('csv', 'parquet', 'feather')을 확장자로 판단하는 함수 (압축 CSV는 'csv')"""
+    return INPUT_FORMATS.get(os.path.splitext(file_path)[1].lower(), 'csv')
 
 
-def load_csv(file_path):
-    """파일을 적절한 인코딩으로 로드하는 함수"""
-    encodings = ['utf-8', 'cp949', 'latin1']
-    for enc in encodings:
+def open_input_binary(file_path):
+    """압축(gz, bz2, xz, zst, zip) 여부에 맞게 풀어서 읽는 바이너리 파일 객체를 반환하는 함수"""
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == '.gz':
+        return gzip.open(file_path, 'rb')
+    if ext == '.bz2':
+        return bz2.open(file_path, 'rb')
+    if ext == '.xz':
+        return lzma.open(file_path, 'rb')
+    if ext == '.zst':
         try:
-            return pd.read_csv(file_path, encoding=enc)
-        except UnicodeDecodeError:
-            continue
+            import zstandard
+        except ImportError:
+            raise ImportError("zstandard is required to read .zst files (pip install zstandard)")
+        return zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb'), closefd=True)
+    if ext == '.zip':
+        archive = zipfile.ZipFile(file_path)
+        names = archive.namelist()
+        if len(names) != 1:
+            raise ValueError(f"zip file must contain exactly one file: {file_path}")
+        return archive.open(names[0])
+    return open(file_path, 'rb')
+
+
+COMPRESSION_RATIO_ESTIMATE = 10  # 풀린 크기를 알 수 없는 압축/열 형식 입력은 디스크 크기의 이 배수로 본다
+
+
+def estimated_input_bytes(file_path):
+    """입력 파일을 풀었을 때의 크기(바이트)를 추정하는 함수
+
+    스트리밍 여부, 파서, 파티션 수를 정할 때 디스크 크기 대신 사용한다. zip은 목록의 원래 크기,
+    gzip은 끝에 기록된 원래 크기를 쓰고, 그 밖의 압축 CSV와 Parquet/Feather(사전 인코딩과 압축으로
+    메모리에서 훨씬 커짐)는 COMPRESSION_RATIO_ESTIMATE배로 크게 잡는다 (작게 잡으면 큰 파일을 메모리에 올리게 되므로).
+    """
+    size = os.path.getsize(file_path)
+    ext = os.path.splitext(file_path)[1].lower()
+    try:
+        if ext == '.zip':
+            with zipfile.ZipFile(file_path) as archive:
+                return sum(info.file_size for info in archive.infolist())
+        if ext == '.gz' and size * COMPRESSION_RATIO_ESTIMATE < 2 ** 32:
+            # gzip 끝 4바이트는 원래 크기를 2^32로 나눈 나머지이므로 4GB를 넘을 수 없는 파일에서만 믿는다
+            with open(file_path, 'rb') as file:
+                file.seek(-4, os.SEEK_END)
+                return max(size, int.from_bytes(file.read(4), 'little'))
+    except (OSError, zipfile.BadZipFile):
+        pass
+    if ext in COMPRESSED_EXTENSIONS or input_format(file_path) != 'csv':
+        return size * COMPRESSION_RATIO_ESTIMATE
+    return size
+
+
+CANDIDATE_ENCODINGS = ['utf-8', 'cp949', 'latin1']  # 앞에서부터 시도하는 인코딩
+ENCODING_BLOCK_SIZE = 1024 * 1024  # 인코딩 검사 시 한 번에 읽는 바이트 수
+ENCODING_SAMPLE_SIZE = 1024 * 1024  # chardet에 넘기거나 미리보기에서 검사하는 최대 바이트 수
+PREVIEW_ROWS = 100  # 비식별화 탭에서 파일을 열 때 미리 읽는 행 수
+
+
+def detect_encoding(file_path, sample_size=ENCODING_SAMPLE_SIZE):
+    """파일 앞부분을 chardet으로 분석하여 인코딩을 추정하는 함수"""
+    with open_input_binary(file_path) as file:
+        result = chardet.detect(file.read(sample_size))
+    return result['encoding']
 
+
+def detect_csv_encoding(file_path, max_bytes=None):
+    """CANDIDATE_ENCODINGS 중 파일 전체를 오류 없이 디코딩할 수 있는 첫 번째 인코딩을 반환하는 함수
+
+    파일을 블록 단위로 한 번만 읽으면서 모든 후보를 동시에 검사하므로,
+    인코딩마다 CSV 전체를 다시 파싱하지 않는다. max_bytes를 주면 앞부분만 검사한다.
+    """
+    decoders = {enc: codecs.getincrementaldecoder(enc)() for enc in CANDIDATE_ENCODINGS}
+    bytes_read = 0
+    with open_input_binary(file_path) as file:
+        while True:
+            block = file.read(ENCODING_BLOCK_SIZE)
+            bytes_read += len(block)
+            # 파일 끝에서만 final=True로 디코딩한다. max_bytes에서 멈출 때 잘린 마지막 문자는 오류로 보지 않는다
+            final = not block
+            stop = final or (max_bytes is not None and bytes_read >= max_bytes)
+            for enc, decoder in list(decoders.items()):
+                # 이어지는 바이트가 없는 상태의 ASCII 블록은 모든 후보에서 유효
+                if not final and block.isascii() and not decoder.getstate()[0]:
+                    continue
+                try:
+                    decoder.decode(block, final=final)
+                except UnicodeDecodeError:
+                    del decoders[enc]
+            remaining = [enc for enc in CANDIDATE_ENCODINGS if enc in decoders]
+            # latin1은 어떤 바이트열도 디코딩하므로, 앞선 후보가 모두 실패하면 더 읽을 필요가 없다
+            if stop or not remaining or remaining[0] == 'latin1':
+                break
+
+    if remaining:
+        return remaining[0]
     # 모든 기본 인코딩이 실패한 경우, 자동 인코딩 탐지 시도
+    return detect_encoding(file_path)
+
+
+def detect_input_encoding(file_path, timer=None):
+    """CSV 입력이면 인코딩을 감지해 반환하고 Parquet/Feather이면 None을 반환하는 함수
+
+    timer(StageTimer)가 주어지면 감지 시간을 'detect encoding' 단계로 따로 기록한다.
+    """
+    if input_format(file_path) != 'csv':
+        return None
+    with timed_stage(timer, 'detect encoding'):
+        return detect_csv_encoding(file_path)
+
+
+# CSV 파서 선택 ('c': pandas 기본 파서, 'pyarrow': 멀티스레드 파서, 'auto': 파일 크기로 결정)
+CSV_ENGINE = 'auto'
+PYARROW_ENGINE_MIN_BYTES = 64 * 1024 * 1024  # 'auto'일 때 이보다 큰 파일은 pyarrow 파서 사용
+
+
+def choose_csv_engine(file_path, engine=None):
+    engine = engine or CSV_ENGINE
+    if engine != 'auto':
+        return engine
+    if estimated_input_bytes(file_path) < PYARROW_ENGINE_MIN_BYTES:
+        return 'c'
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return 'c'
+    return 'pyarrow'
+
+
+def _is_temporal(series):
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return True
+    if series.dtype == object:
+        first = series.first_valid_index()
+        return first is not None and isinstance(series[first], (datetime.date, datetime.time))
+    return False
+
+
+def _read_csv_pyarrow(file_path, encoding, columns=None):
+    """pyarrow의 멀티스레드 파서로 CSV를 읽되, 결과 dtype은 pandas 기본 파서와 같게 맞추는 함수"""
+    import pyarrow as pa
+    import pyarrow.csv as pv
+
+    df = pd.read_csv(file_path, encoding=encoding, usecols=columns, engine='pyarrow')
+    # pyarrow는 날짜/시간처럼 보이는 컬럼을 자동으로 변환하므로, 이런 컬럼은 원문 문자열로 다시 읽는다
+    temporal = [column for column in df.columns if _is_temporal(df[column])]
+    if temporal:
+        convert_options = pv.ConvertOptions(include_columns=temporal, strings_can_be_null=True,
+                                            column_types={column: pa.string() for column in temporal})
+        with open_input_binary(file_path) as file:
+            table = pv.read_csv(file, pv.ReadOptions(encoding=encoding), convert_options=convert_options)
+        for column in temporal:
+            df[column] = table.column(column).to_pandas()
+    return df
+
+
+def read_table(file_path, columns=None, engine=None, encoding=None):
+    """CSV(압축 포함), Parquet, Feather 파일을 읽어 반환하는 함수 (실패 시 예외 발생)
+
+    columns를 주면 해당 컬럼만 읽는다. Parquet/Feather는 나머지 컬럼을 디스크에서 읽지도 않는다.
+    CSV 인코딩(encoding)을 주지 않으면 detect_csv_encoding으로 감지한다.
+    CSV 파서는 engine(기본값 CSV_ENGINE)으로 고르며, pyarrow 파서가 실패하면 기본 파서로 다시 읽는다.
+    파일 형식은 df.attrs['format'], CSV의 인코딩과 파서는 df.attrs['encoding'], df.attrs['engine']에 기록된다.
+    """
+    file_format = input_format(file_path)
+    if file_format != 'csv':
+        encoding = None
+    if file_format == 'parquet':
+        df = pd.read_parquet(file_path, columns=columns)
+        engine = None
+    elif file_format == 'feather':
+        df = pd.read_feather(file_path, columns=columns)
+        engine = None
+    else:
+        encoding = encoding or detect_csv_encoding(file_path)
+        engine = choose_csv_engine(file_path, engine)
+        if engine == 'pyarrow':
+            try:
+                df = _read_csv_pyarrow(file_path, encoding, columns)
+            except ValueError:
+                # 앞부분으로 추론한 타입과 맞지 않는 값이 뒤에 있는 경우 등
+                engine = 'c'
+        if engine == 'c':
+            df = pd.read_csv(file_path, encoding=encoding, usecols=columns)
+    df.attrs['format'] = file_format
+    df.attrs['encoding'] = encoding
+    df.attrs['engine'] = engine
+    return df
+
+
+def iter_table_chunks(file_path, chunksize, encoding=None, dtypes=None, columns=None):
+    """파일을 chunksize 행씩 DataFrame으로 읽어 차례로 반환하는 제너레이터
+
+    CSV는 read_csv(chunksize=...)로, Parquet/Feather는 레코드 배치 단위로 읽는다.
+    dtypes를 주면 모든 청크를 해당 dtype으로 맞춘다.
+    """
+    file_format = input_format(file_path)
+    if file_format == 'csv':
+        yield from pd.read_csv(file_path, encoding=encoding, dtype=dtypes, chunksize=chunksize, usecols=columns)
+        return
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if file_format == 'parquet':
+        parquet_file = pq.ParquetFile(file_path)
+        schema = parquet_file.schema_arrow
+        batches = parquet_file.iter_batches(batch_size=chunksize, columns=columns)
+    else:
+        reader = pa.ipc.open_file(pa.memory_map(file_path))
+        schema = reader.schema
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        if columns is not None:
+            batches = (batch.select(columns) for batch in batches)
+
+    empty = True
+    for batch in batches:
+        for offset in range(0, batch.num_rows, chunksize):
+            empty = False
+            yield _cast_chunk(batch.slice(offset, chunksize).to_pandas(), dtypes)
+    if empty:
+        # 행이 없는 파일도 컬럼 정보가 담긴 빈 청크 하나는 반환
+        table = schema.empty_table()
+        yield _cast_chunk(table.select(columns).to_pandas() if columns is not None else table.to_pandas(), dtypes)
+
+
+def read_table_preview(file_path, nrows=None):
+    """헤더와 앞부분 nrows 행만 읽어 반환하는 함수 (컬럼 목록 표시용)
+
+    CSV 인코딩도 앞부분만 보고 정하므로 파일 크기와 상관없이 빠르다.
+    실제 비식별화는 실행 시점에 파일 전체를 다시 읽어서 수행한다.
+    """
+    nrows = nrows if nrows is not None else PREVIEW_ROWS
+    encoding = None
+    if input_format(file_path) == 'csv':
+        encoding = detect_csv_encoding(file_path, max_bytes=ENCODING_SAMPLE_SIZE)
+    # nrows=0이면 헤더(컬럼 목록)만 필요하므로 한 행만 읽고 버린다
+    chunks = iter_table_chunks(file_path, max(nrows, 1), encoding)
     try:
-        encoding = detect_encoding(file_path)
-        return pd.read_csv(file_path, encoding=encoding)
+        df = next(chunks).head(nrows)
+    finally:
+        chunks.close()
+    df.attrs['format'] = input_format(file_path)
+    df.attrs['encoding'] = encoding
+    return df
+
+
+def _cast_chunk(chunk, dtypes):
+    if dtypes is None:
+        return chunk
+    return chunk.astype({column: dtype for column, dtype in dtypes.items() if column in chunk.columns})
+
+
+# 로드 후 dtype 최적화 (메모리 절약)
+OPTIMIZE_DTYPES = True
+CATEGORY_MAX_UNIQUE_RATIO = 0.5  # 고유값 비율이 이 이하인 문자열 컬럼은 category로 변환
+PHONE_COLUMN_HINTS = ('phone', 'tel', 'mobile', '전화', '휴대', '핸드폰', '연락처')
+PHONE_PATTERN = r'^0?1\d-?\d{3,4}-?\d{4}$|^0\d{1,2}-\d{3,4}-\d{4}$'
+
+
+def is_phone_like(column, series):
+    """컬럼 이름이나 값이 전화번호처럼 보이는지 판단하는 함수"""
+    if any(hint in str(column).lower() for hint in PHONE_COLUMN_HINTS):
+        return True
+    if pd.api.types.is_string_dtype(series) or series.dtype == object:
+        sample = series.dropna().head(100).astype(str)
+        return len(sample) > 0 and sample.str.match(PHONE_PATTERN).all()
+    return False
+
+
+def optimize_dtypes(df):
+    """메모리를 덜 쓰는 dtype으로 바꾼 DataFrame을 반환하는 함수
+
+    정수는 가능한 가장 작은 정수형으로, 중복이 많은 문자열은 category로 바꾼다.
+    값이나 저장 결과가 달라질 수 있는 변환(실수 다운캐스트 등)은 하지 않으며,
+    전화번호로 보이는 컬럼은 읽은 그대로 둔다. 변환 전후 메모리는
+    df.attrs['memory_before'], df.attrs['memory_after']에 기록된다.
+    """
+    attrs = dict(df.attrs)
+    memory_before = int(df.memory_usage(deep=True).sum())
+    optimized = df.copy(deep=False)
+    for column in df.columns:
+        series = df[column]
+        if is_phone_like(column, series):
+            continue
+        if pd.api.types.is_integer_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            optimized[column] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_string_dtype(series) or series.dtype == object:
+            if len(series) and series.nunique() <= len(series) * CATEGORY_MAX_UNIQUE_RATIO:
+                optimized[column] = series.astype('category')
+    optimized.attrs.update(attrs)
+    optimized.attrs['memory_before'] = memory_before
+    optimized.attrs['memory_after'] = int(optimized.memory_usage(deep=True).sum())
+    return optimized
+
+
+def format_memory_report(df):
+    """optimize_dtypes가 기록한 메모리 변화를 문자열로 반환하는 함수"""
+    before, after = df.attrs.get('memory_before'), df.attrs.get('memory_after')
+    if not before:
+        return ""
+    return f"memory {before / 1024 ** 2:.1f} MB -> {after / 1024 ** 2:.1f} MB ({(after - before) / before:+.0%})"
+
+
+def load_csv(file_path, preview=False):
+    """파일을 적절한 인코딩으로 로드하는 함수 (preview=True이면 헤더와 앞부분만 로드)"""
+    try:
+        if preview:
+            return read_table_preview(file_path)
+        df = read_table(file_path)
+        return optimize_dtypes(df) if OPTIMIZE_DTYPES else df
     except Exception as e:
         messagebox.showerror("Error", f"Failed to load CSV file: {e}")
         return None
 
 
+# 결과 파일 저장 (CSV / Parquet / Feather)
+OUTPUT_FORMATS = {'.csv': 'csv', '.parquet': 'parquet', '.pq': 'parquet', '.feather': 'feather', '.arrow': 'feather'}
+DEFAULT_COMPRESSION = {'parquet': 'snappy', 'feather': 'lz4'}
+SAVE_FILETYPES = [("CSV files", "*.csv"), ("Parquet files", "*.parquet"), ("Feather files", "*.feather")]
+
+
+def output_format(path, file_format=None):
+    """저장 형식을 반환하는 함수 (지정하지 않으면 확장자로 결정, 알 수 없는 확장자는 CSV)"""
+    if file_format:
+        return file_format
+    return OUTPUT_FORMATS.get(os.path.splitext(path)[1].lower(), 'csv')
+
+
+def _is_binary(series):
+    """값이 bytes인 object 컬럼(raw 해시 결과)인지 판단하는 함수"""
+    first = series.first_valid_index()
+    return series.dtype == object and first is not None and isinstance(series[first], bytes)
+
+
+def _to_arrow_table(df, schema=None):
+    import pyarrow as pa
+
+    df = df.copy(deep=False)
+    # read_table이 기록한 읽기 정보(df.attrs)는 결과 파일의 메타데이터에 남기지 않는다
+    df.attrs = {}
+    text_columns = set()
+    for column in df.columns:
+        # object 컬럼에는 숫자와 문자열이 섞여 있을 수 있으므로 문자열로 통일 (raw 해시 값은 바이너리로 유지)
+        if df[column].dtype == object and not _is_binary(df[column]):
+            df[column] = df[column].map(str, na_action='ignore')
+            text_columns.add(column)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if schema is None:
+        # 첫 청크에서 전부 결측인 컬럼(null, 또는 NaN만 있는 object 컬럼의 double)도 이후 청크와 맞도록 문자열로 둔다
+        schema = pa.schema([
+            field.with_type(pa.large_string())
+            if pa.types.is_null(field.type) or pa.types.is_string(field.type) or field.name in text_columns
+            else field
+            for field in table.schema], metadata=table.schema.metadata)
+    return table.cast(schema)
+
+
+class TableWriter:
+    """DataFrame을 청크 단위로 이어서 CSV, Parquet 또는 Feather(Arrow IPC) 파일로 쓰는 클래스
+
+    append=True면 기존 CSV 파일 뒤에 헤더 없이 이어 쓴다 (CSV만 가능).
+    """
+
+    def __init__(self, path, csv_encoding='utf-8', file_format=None, compression=None, append=False):
+        self.path = path
+        self.format = output_format(path, file_format)
+        if self.format not in DEFAULT_COMPRESSION and self.format != 'csv':
+            raise ValueError(f"unsupported output format: {self.format}")
+        if append and self.format != 'csv':
+            raise ValueError(f"cannot append to a {self.format} file")
+        self.append = append
+        self.compression = compression or DEFAULT_COMPRESSION.get(self.format)
+        if self.compression == 'none':
+            self.compression = None
+        self.csv_encoding = csv_encoding
+        self._file = None
+        self._writer = None
+        self._schema = None
+
+    def write(self, df):
+        if self.format == 'csv':
+            header = self._file is None and not self.append
+            if self._file is None:
+                binary_columns = [column for column in df.columns if _is_binary(df[column])]
+                if binary_columns:
+                    raise ValueError(f"columns {binary_columns} hold raw digests, which can only be written "
+                                     "to parquet or feather; use another digest encoding for CSV output")
+                self._file = open(self.path, 'a' if self.append else 'w', encoding=self.csv_encoding, newline='')
+            df.to_csv(self._file, sep=",", index=False, header=header)
+            return
+
+        table = _to_arrow_table(df, self._schema)
+        if self._writer is None:
+            self._schema = table.schema
+            self._writer = self._open_arrow_writer(table.schema)
+        self._writer.write_table(table)
+
+    def _open_arrow_writer(self, schema):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(f"pyarrow is required to write {self.format} files (pip install pyarrow)")
+        if self.format == 'parquet':
+            return pq.ParquetWriter(self.path, schema, compression=self.compression or 'none')
+        options = pa.ipc.IpcWriteOptions(compression=self.compression)
+        return pa.ipc.new_file(self.path, schema, options=options)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        if self._writer is not None:
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_table(df, path, csv_encoding='utf-8', file_format=None, compression=None, progress=None, chunksize=None):
+    """DataFrame을 확장자(또는 file_format)에 맞는 형식으로 저장하는 함수
+
+    progress가 주어지면 chunksize(기본값 CHUNK_SIZE) 행씩 나눠 쓰면서 조각을 쓰기 전마다
+    progress(저장한 행 수, 전체 행 수)를 호출한다 (작업 취소를 확인할 수 있도록).
+    """
+    with TableWriter(path, csv_encoding, file_format, compression) as writer:
+        if progress is None:
+            writer.write(df)
+            return
+        chunksize = chunksize or CHUNK_SIZE
+        for start in range(0, max(len(df), 1), chunksize):
+            progress(start, len(df))
+            writer.write(df.iloc[start:start + chunksize])
+
+
 def load_csv_1():
-    global df1
-    file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
+    global df1, file_path1
+    file_path = filedialog.askopenfilename(filetypes=OPEN_FILETYPES)
     if file_path:
-        df1 = load_csv(file_path)
+        # 큰 파일은 병합할 때 디스크에서 나눠 읽으므로 컬럼 목록을 보여 줄 앞부분만 로드한다
+        df1 = load_csv(file_path, preview=estimated_input_bytes(file_path) > STREAMING_THRESHOLD_BYTES)
         if df1 is not None:
+            file_path1 = file_path
+            label_csv1.config(text=f"CSV 1 Columns ({df1.attrs['encoding'] or df1.attrs['format']})")
+            status_label.config(text=format_memory_report(df1))
             listbox_csv1.delete(0, tk.END)
             for column in df1.columns:
                 listbox_csv1.insert(tk.END, column)
@@ -53,11 +511,15 @@ def load_csv_1():
 
 
 def load_csv_2():
-    global df2
-    file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
+    global df2, file_path2
+    file_path = filedialog.askopenfilename(filetypes=OPEN_FILETYPES)
     if file_path:
-        df2 = load_csv(file_path)
+        # 큰 파일은 병합할 때 디스크에서 나눠 읽으므로 컬럼 목록을 보여 줄 앞부분만 로드한다
+        df2 = load_csv(file_path, preview=estimated_input_bytes(file_path) > STREAMING_THRESHOLD_BYTES)
         if df2 is not None:
+            file_path2 = file_path
+            label_csv2.config(text=f"CSV 2 Columns ({df2.attrs['encoding'] or df2.attrs['format']})")
+            status_label.config(text=format_memory_report(df2))
             listbox_csv2.delete(0, tk.END)
             for column in df2.columns:
                 listbox_csv2.insert(tk.END, column)
@@ -84,33 +546,305 @@ def highlight_common_keys():
             key_menu.current(0)
 
 
+# 병합 방식: semi/anti는 다른 입력에 key가 있는(없는) 첫 번째 입력의 행만 남기며 다른 입력의 컬럼은 붙이지 않는다
+JOIN_TYPES = ('outer', 'inner', 'left', 'right', 'semi', 'anti')
+
+
+def _is_sorted_key(series):
+    # 정렬된 숫자 키만 해시 테이블 없이 병합할 수 있다 (결측이 있으면 정렬되지 않은 것으로 본다)
+    return ((pd.api.types.is_integer_dtype(series) or pd.api.types.is_float_dtype(series))
+            and series.is_monotonic_increasing)
+
+
+def _merge_sorted(left, right, key, how):
+    """key로 정렬된 두 DataFrame을 인덱스 병합(정렬 병합)으로 join하는 함수 (pd.merge와 같은 결과)"""
+    joined = left.set_index(key).join(right.set_index(key), how=how, lsuffix='_x', rsuffix='_y').reset_index()
+    return joined[pd.merge(left.head(0), right.head(0), how=how, on=key).columns]
+
+
+def merge_dataframes(left, right, key, how='outer'):
+    """두 DataFrame을 key 컬럼 기준으로 how 방식(JOIN_TYPES)으로 join하는 함수
+
+    양쪽 key가 이미 오름차순으로 정렬된 같은 dtype의 숫자이면 해시 테이블을 만들지 않고 정렬 병합한다.
+    """
+    if how not in JOIN_TYPES:
+        raise ValueError(f"unknown join type {how!r}; expected one of: {', '.join(JOIN_TYPES)}")
+    if how in ('semi', 'anti'):
+        matched = left[key].isin(right[key])
+        return left[matched if how == 'semi' else ~matched].reset_index(drop=True)
+    # dtype이 다르면 인덱스 join이 key를 pd.merge와 다르게 변환하므로(int + float -> float) 정렬 병합하지 않는다
+    if left[key].dtype == right[key].dtype and _is_sorted_key(left[key]) and _is_sorted_key(right[key]):
+        return _merge_sorted(left, right, key, how)
+    return pd.merge(left, right, how=how, on=key)
+
+
+def merge_many(frames, key, how='outer'):
+    """여러 DataFrame을 key 컬럼 기준으로 차례로 how 방식으로 join하는 함수
+
+    두 개일 때는 merge_dataframes와 같다. 세 개 이상이면 key가 아닌 컬럼 중 여러 입력에
+    같은 이름으로 있는 컬럼에 입력 순서대로 _1, _2, ...를 붙여 구분한다.
+    semi/anti는 두 번째 입력부터 key 컬럼만 사용한다.
+    """
+    if how in ('semi', 'anti'):
+        frames = [frames[0]] + [frame[[key]] for frame in frames[1:]]
+    if len(frames) == 2:
+        return merge_dataframes(frames[0], frames[1], key, how)
+    counts = collections.Counter(column for frame in frames for column in frame.columns if column != key)
+    frames = [frame.rename(columns={column: f"{column}_{i + 1}" for column in frame.columns
+                                    if column != key and counts[column] > 1})
+              for i, frame in enumerate(frames)]
+    return functools.reduce(lambda left, right: merge_dataframes(left, right, key, how), frames)
+
+
+# 병합 전 키 분석 (결과 행 수가 폭증하는 병합을 미리 알림)
+JOIN_FANOUT_WARNING = 10  # 예상 결과 행 수가 입력 행 수 합의 이 배수를 넘으면 위험한 병합으로 본다
+
+
+def _normalize_key(series):
+    # 숫자 키는 그대로 두고, 문자열/범주형 키는 값 비교가 같도록 문자열로 맞춘다
+    if pd.api.types.is_numeric_dtype(series) and not isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    return series.astype(object).where(series.isna(), series.astype(str))
+
+
+def key_counts(source, key, chunksize=None):
+    """DataFrame 또는 파일의 key 값별 행 수(결측 포함)를 반환하는 함수
+
+    파일은 key 컬럼만 청크 단위로 읽으므로 메모리 사용량은 고유 키 수에 비례한다.
+    """
+    if isinstance(source, pd.DataFrame):
+        if key not in source.columns:
+            raise ValueError(f"key column {key!r} not found")
+        return _normalize_key(source[key]).value_counts(dropna=False)
+    if key not in read_table_preview(source, nrows=0).columns:
+        raise ValueError(f"key column {key!r} not found in {source}")
+    encoding = detect_csv_encoding(source) if input_format(source) == 'csv' else None
+    counts = [_normalize_key(chunk[key]).value_counts(dropna=False)
+              for chunk in iter_table_chunks(source, chunksize or CHUNK_SIZE, encoding, columns=[key])]
+    return pd.concat(counts).groupby(level=0, dropna=False).sum()
+
+
+def _join_counts(left, right, how='outer'):
+    """두 입력의 키별 행 수로 how 방식 join 결과의 키별 행 수를 구하는 함수 (양쪽에 있으면 곱, 한쪽에만 있으면 그대로)"""
+    both = pd.concat([left, right], axis=1, keys=['left', 'right'])
+    left, right = both['left'], both['right']
+    if how == 'outer':
+        return left.fillna(1) * right.fillna(1)
+    if how == 'inner':
+        return (left * right).dropna()
+    if how == 'left':
+        return (left * right.fillna(1))[left.notna()]
+    if how == 'right':
+        return (left.fillna(1) * right)[right.notna()]
+    if how == 'semi':
+        return left[left.notna() & right.notna()]
+    return left[left.notna() & right.isna()]
+
+
+def analyze_join(sources, key, chunksize=None, how='outer', progress=None):
+    """병합하기 전에 key를 기준으로 입력별 통계와 how 방식 join 결과 행 수를 계산하는 함수
+
+    sources는 DataFrame 또는 파일 경로 목록이다. key 값별 행 수만 세므로 결과 행 수는 추정이 아니라
+    정확한 값이며, 예상 행 수가 입력 행 수 합의 JOIN_FANOUT_WARNING배를 넘으면 'dangerous'가 True가 된다.
+    progress가 주어지면 입력 하나를 셀 때마다 progress(완료 입력 수, 전체 입력 수)를 호출한다.
+    """
+    if how not in JOIN_TYPES:
+        raise ValueError(f"unknown join type {how!r}; expected one of: {', '.join(JOIN_TYPES)}")
+    counts = []
+    for source in sources:
+        counts.append(key_counts(source, key, chunksize))
+        if progress is not None:
+            progress(len(counts), len(sources))
+    inputs = []
+    for i, count in enumerate(counts):
+        others = pd.Index([]).append([other.index for j, other in enumerate(counts) if j != i])
+        matched = count[count.index.isin(others)]
+        rows = int(count.sum())
+        inputs.append({
+            'rows': rows,
+            'distinct_keys': len(count),
+            'max_duplicates': int(count.max()) if rows else 0,
+            'match_rate': float(matched.sum() / rows) if rows else 0.0,
+        })
+    estimated_rows = int(functools.reduce(lambda left, right: _join_counts(left, right, how), counts).sum())
+    input_rows = sum(info['rows'] for info in inputs)
+    fanout = estimated_rows / input_rows if input_rows else 0.0
+    return {
+        'key': key,
+        'how': how,
+        'inputs': inputs,
+        'estimated_rows': estimated_rows,
+        'fanout': fanout,
+        'dangerous': estimated_rows > JOIN_FANOUT_WARNING * max(1, input_rows),
+    }
+
+
+def format_join_report(report, names=None):
+    """analyze_join 결과를 사람이 읽을 수 있는 문자열로 반환하는 함수"""
+    lines = [f"key {report['key']!r} ({report['how']} join): {report['estimated_rows']:,} output rows "
+             f"({report['fanout']:.1f}x the input rows)"]
+    for i, info in enumerate(report['inputs']):
+        name = names[i] if names else f"input {i + 1}"
+        lines.append(f"  {name}: {info['rows']:,} rows, {info['distinct_keys']:,} distinct keys, "
+                     f"up to {info['max_duplicates']:,} rows per key, {info['match_rate']:.1%} matched")
+    if report['dangerous']:
+        lines.append(f"  WARNING: the merge would produce more than {JOIN_FANOUT_WARNING}x the input rows "
+                     "(duplicate keys multiply). Check that this is the right key.")
+    return "\n".join(lines)
+
+
 def merge_csv():
     if df1 is not None and df2 is not None:
         selected_key = key_menu.get()
         if not selected_key:
             messagebox.showerror("Error", "Please select a key column for merging.")
             return
+        how = how_menu.get()
+        left, right, path1, path2 = df1, df2, file_path1, file_path2
+        # 큰 파일은 앞부분만 로드되어 있으므로 분석과 병합 모두 파일에서 읽는다
+        streaming = estimated_input_bytes(path1) + estimated_input_bytes(path2) > STREAMING_THRESHOLD_BYTES
+
+        def start_merge():
+            save_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=SAVE_FILETYPES)
+            if not save_path:
+                return
 
-        df_to_merge = pd.merge(df1, df2, how='outer', on=selected_key)
-        save_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
-        if save_path:
-            try:
-                df_to_merge.to_csv(save_path, sep=",", index=False, encoding='utf-8-sig')
-                messagebox.showinfo("Success", f"CSV files merged and saved successfully as {save_path}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to save the CSV file: {e}")
+            def task(progress):
+                timer = StageTimer()
+                # 큰 파일은 메모리에서 병합하지 않고 디스크에 분할하여 병합
+                if streaming:
+                    merge_csv_files(path1, path2, selected_key, save_path, progress=progress, timer=timer, how=how)
+                else:
+                    progress(0, 0)
+                    with timer.stage('merge', len(left) + len(right)):
+                        df_to_merge = merge_dataframes(left, right, selected_key, how)
+                    with timer.stage('save', len(df_to_merge)):
+                        write_table(df_to_merge, save_path, csv_encoding='utf-8-sig', progress=progress)
+                return timer.format_summary()
+
+            run_in_background(task, save_path,
+                              f"CSV files merged and saved successfully as {save_path}",
+                              "Failed to save the CSV file")
+
+        sources = [path1, path2] if streaming else [left, right]
+        confirm_join(sources, selected_key, [os.path.basename(path1), os.path.basename(path2)], how, start_merge)
     else:
         messagebox.showerror("Error", "Please load two CSV files first.")
 
 
+def confirm_join(sources, key, names, how, on_confirm):
+    """작업 스레드에서 키를 분석하고, 위험한 병합이면 계속할지 물은 뒤 계속하면 on_confirm()을 호출하는 함수
+
+    큰 파일의 키를 세는 동안 창이 멈추지 않도록 분석은 run_in_background로 실행하고,
+    묻는 창과 on_confirm()은 완료 후 메인 스레드에서 실행한다.
+    """
+    def task(progress):
+        return analyze_join(sources, key, how=how, progress=progress)
+
+    def on_analyzed(report):
+        summary = format_join_report(report, names)
+        status_label.config(text=f"{report['estimated_rows']:,} rows expected")
+        if report['dangerous'] and not messagebox.askyesno("Warning", f"{summary}\n\nMerge anyway?",
+                                                           icon='warning'):
+            return
+        on_confirm()
+
+    status_label.config(text="Analyzing keys...")
+    run_in_background(task, None, None, "Failed to analyze the key column", on_success=on_analyzed)
+
+
+def ask_key_column(columns, prompt="Key column shared by all files:"):
+    """columns 중 키 컬럼을 고르는 대화상자를 띄우고 고른 컬럼을 반환하는 함수 (취소하면 None)"""
+    dialog = tk.Toplevel(window)
+    dialog.title("Select Key Column")
+    dialog.transient(window)
+    dialog.grab_set()
+    tk.Label(dialog, text=prompt).pack(padx=10, pady=5)
+    menu = ttk.Combobox(dialog, state="readonly", values=columns)
+    menu.current(0)
+    menu.pack(padx=10, pady=5)
+    chosen = []
+
+    def accept():
+        chosen.append(menu.get())
+        dialog.destroy()
+
+    tk.Button(dialog, text="OK", command=accept).pack(side=tk.LEFT, padx=10, pady=10)
+    tk.Button(dialog, text="Cancel", command=dialog.destroy).pack(side=tk.RIGHT, padx=10, pady=10)
+    window.wait_window(dialog)
+    return chosen[0] if chosen else None
+
+
+def merge_multiple_files():
+    file_paths = list(filedialog.askopenfilenames(filetypes=OPEN_FILETYPES))
+    if not file_paths:
+        return
+    if len(file_paths) < 2:
+        messagebox.showerror("Error", "Please select two or more files to merge.")
+        return
+    headers = []
+    for path in file_paths:
+        preview = load_csv(path, preview=True)
+        if preview is None:
+            return
+        headers.append(list(preview.columns))
+    common_columns = [column for column in headers[0] if all(column in header for header in headers[1:])]
+    if not common_columns:
+        messagebox.showerror("Error", "The selected files have no column in common.")
+        return
+    selected_key = ask_key_column(common_columns)
+    if not selected_key:
+        return
+    how = how_menu.get()
+
+    def start_merge():
+        save_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=SAVE_FILETYPES)
+        if not save_path:
+            return
+
+        def task(progress):
+            timer = StageTimer()
+            # 큰 파일은 메모리에서 병합하지 않고 디스크에 분할하여 한 번에 병합
+            if sum(estimated_input_bytes(path) for path in file_paths) > STREAMING_THRESHOLD_BYTES:
+                merge_files(file_paths, selected_key, save_path, progress=progress, timer=timer, how=how)
+            else:
+                frames = []
+                for i, path in enumerate(file_paths):
+                    progress(i, len(file_paths))
+                    encoding = detect_input_encoding(path, timer)
+                    with timer.stage('load') as record:
+                        # semi/anti는 두 번째 파일부터 key 컬럼만 읽는다
+                        df = read_table(path, columns=[selected_key] if i and how in ('semi', 'anti') else None,
+                                        encoding=encoding)
+                        frames.append(optimize_dtypes(df) if OPTIMIZE_DTYPES else df)
+                        record['rows'] = len(df)
+                progress(0, 0)
+                with timer.stage('merge', sum(len(df) for df in frames)):
+                    df_merged = merge_many(frames, selected_key, how)
+                with timer.stage('save', len(df_merged)):
+                    write_table(df_merged, save_path, csv_encoding='utf-8-sig', progress=progress)
+            return timer.format_summary()
+
+        run_in_background(task, save_path,
+                          f"{len(file_paths)} files merged and saved successfully as {save_path}",
+                          "Failed to save the merged file")
+
+    confirm_join(file_paths, selected_key, [os.path.basename(path) for path in file_paths], how, start_merge)
+
+
 # 비식별화 관련 함수들
+def _is_missing(value):
+    # 값 단위 함수에서도 None을 NaN과 같은 결측값으로 취급한다 (컬럼 단위 함수와 같게)
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+
 def sha256_text(text):
-    text_str = str(text)
+    text_str = 'nan' if text is None else str(text)
     return hashlib.sha256(text_str.encode()).hexdigest()
 
 
 def mask_name(name):
-    if isinstance(name, float) and np.isnan(name):
+    if _is_missing(name):
         return name
     name_str = str(name)
     if len(name_str) == 2:
@@ -124,20 +858,23 @@ def mask_name(name):
 
 
 def mask_phone(phone):
-    phone_str = str(phone)
+    phone_str = 'nan' if phone is None else str(phone)
     return '0' + phone_str[:2] + '-' + '****' + '-' + phone_str[6:]
 
 
-def categorize_age(birthdate):
-    if isinstance(birthdate, float) and np.isnan(birthdate):
+def categorize_age(birthdate, today=None):
+    if _is_missing(birthdate):
         return birthdate  # 결측값인 경우 그대로 반환
 
     try:
         birthdate = pd.to_datetime(birthdate)
     except (ValueError, TypeError):
         return 'Invalid Date'  # 잘못된 날짜 형식인 경우 반환
+    if pd.isna(birthdate):
+        return 'Invalid Date'  # 빈 문자열 등 NaT로 변환된 경우
 
-    today = pd.Timestamp.now()
+    if today is None:
+        today = pd.Timestamp.now()
     age = today.year - birthdate.year - ((today.month, today.day) < (birthdate.month, birthdate.day))
     if age < 20:
         return '10대'
@@ -152,7 +889,7 @@ def categorize_age(birthdate):
 
 
 def mask_address(address):
-    if isinstance(address, float) and np.isnan(address):
+    if _is_missing(address):
         return address
     address_str = str(address)
     parts = address_str.split(' ')
@@ -171,6 +908,1169 @@ def round_up_monthly_payment(payment):
     return np.ceil(payment / 100000) * 100000
 
 
+# 컬럼 단위(벡터화) 비식별화 함수들
+# 위의 값 단위 함수와 같은 결과를 내되, Series 전체에 한 번에 적용한다.
+def _to_str(series):
+    """각 값에 str()을 적용한 것과 같은 문자열 Series를 반환하는 함수"""
+    return series.astype(str).fillna('nan').astype(object)
+
+
+# SHA-256 해싱용 프로세스 풀 설정
+HASH_WORKERS = os.cpu_count() or 1  # 해싱에 사용할 프로세스 수
+PARALLEL_HASH_MIN_ROWS = 10000  # 고유값이 이보다 적으면 프로세스 풀을 쓰지 않음 (CHUNK_SIZE 청크는 풀을 사용)
+HASH_BATCH_SIZE = 50000  # 작업자 하나에 한 번에 넘기는 값의 최대 수
+_hash_pool = None
+
+
+def set_hash_workers(workers):
+    """해싱에 사용할 프로세스 수를 바꾸는 함수 (기존 풀은 종료)"""
+    global HASH_WORKERS, _hash_pool
+    HASH_WORKERS = max(1, workers)
+    if _hash_pool is not None:
+        _hash_pool.shutdown()
+        _hash_pool = None
+
+
+def _get_hash_pool():
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ProcessPoolExecutor(max_workers=HASH_WORKERS)
+    return _hash_pool
+
+
+def _sha256_batch(values, digest_size=32):
+    return [hashlib.sha256(v.encode()).digest()[:digest_size] for v in values]
+
+
+# 비밀 키를 사용하는 해싱 (HMAC-SHA256, BLAKE2b 키 모드)
+HASH_SECRET_ENV = 'ANONYMIZER_SECRET'  # 비밀 키를 읽어 올 환경 변수
+DEFAULT_DIGEST_SIZE = 32  # 결과 해시 길이 (바이트)
+HASH_MAX_DIGEST_SIZE = {'sha256': 32, 'hmac-sha256': 32, 'blake2b': 64}
+
+# 해시 결과 표기 방식. 32바이트 기준 hex는 64자, base64는 43자, base32는 52자이고
+# raw는 바이트 그대로(bytes) 두므로 Parquet/Feather로 저장할 때만 사용할 수 있다.
+DIGEST_ENCODINGS = {
+    'hex': bytes.hex,
+    'base64': lambda digest: base64.urlsafe_b64encode(digest).rstrip(b'=').decode('ascii'),
+    'base32': lambda digest: base64.b32encode(digest).rstrip(b'=').decode('ascii'),
+    'raw': bytes,
+}
+
+
+def _keyed_hasher(algorithm, key, digest_size):
+    if algorithm == 'hmac-sha256':
+        return hmac.new(key, digestmod=hashlib.sha256)
+    return hashlib.blake2b(key=key, digest_size=digest_size)
+
+
+def _keyed_hash_batch(algorithm, key, digest_size, values):
+    # 키를 넣은 초기 상태를 한 번만 만들고, 값마다 그 상태를 복사해서 사용한다
+    base = _keyed_hasher(algorithm, key, digest_size)
+    digests = []
+    for v in values:
+        hasher = base.copy()
+        hasher.update(v.encode())
+        digests.append(hasher.digest()[:digest_size])
+    return digests
+
+
+def _transform_unique(series, column_func):
+    """고유값마다 한 번만 변환하고, 그 결과를 원래 행 순서대로 펼쳐 반환하는 함수"""
+    if series.empty:
+        return series.copy()
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    transformed = column_func(pd.Series(uniques, name=series.name))
+    return transformed.iloc[codes].set_axis(series.index)
+
+
+def digest_collision_probability(distinct_values, digest_size):
+    """서로 다른 값 distinct_values개를 digest_size바이트 해시로 줄였을 때 충돌이 하나라도 생길 확률의 상한
+
+    생일 문제 한계 n(n-1)/2 / 2^(8*digest_size)를 사용한다. 예를 들어 값 1억 개를
+    8바이트로 줄이면 약 2.7e-4, 16바이트로 줄이면 약 1.5e-23이다.
+    """
+    n = distinct_values
+    return min(1.0, n * (n - 1) / 2 / 2.0 ** (8 * digest_size))
+
+
+def _hash_options(options, algorithm):
+    """옵션에서 해시 길이와 표기 방식을 꺼내 검사한 뒤 반환하는 함수"""
+    options = options or {}
+    digest_size = options.get('digest_size') or DEFAULT_DIGEST_SIZE
+    if not 1 <= digest_size <= HASH_MAX_DIGEST_SIZE[algorithm]:
+        raise ValueError(f"digest size for {algorithm} must be between 1 and "
+                         f"{HASH_MAX_DIGEST_SIZE[algorithm]} bytes, got {digest_size}")
+    digest_encoding = options.get('digest_encoding') or 'hex'
+    if digest_encoding not in DIGEST_ENCODINGS:
+        raise ValueError(f"unknown digest encoding {digest_encoding!r}; expected one of: "
+                         + ", ".join(DIGEST_ENCODINGS))
+    return digest_size, digest_encoding
+
+
+def _str_values(values):
+    # 정수 고유값 배열은 여기서 문자열로 바꾼다 (str()을 적용한 것과 같음)
+    if isinstance(values, np.ndarray):
+        return list(map(str, values.tolist()))
+    return values
+
+
+def _pack_values(values):
+    """문자열 목록을 (이어 붙인 문자열, 길이 배열)로 묶는 함수 (정수 배열은 그대로 반환)
+
+    값마다 str 객체를 피클링하지 않고 문자열 하나와 배열 하나만 작업자에게 보내기 위해 사용한다.
+    """
+    if isinstance(values, np.ndarray):
+        return values
+    lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+    return ''.join(values), lengths
+
+
+def _hash_packed(batch_func, digest_encoding, packed):
+    """작업자에서 실행: 묶인 값을 해싱하고 표기 방식으로 바꾼 뒤 고정 길이 결과를 버퍼 하나로 이어 붙여 반환"""
+    if isinstance(packed, np.ndarray):
+        values = _str_values(packed)
+    else:
+        text, lengths = packed
+        ends = np.cumsum(lengths).tolist()
+        values = [text[start:end] for start, end in zip([0] + ends[:-1], ends)]
+    digests = batch_func(values)
+    if digest_encoding == 'raw':
+        return b''.join(digests)
+    if digest_encoding == 'hex':
+        return b''.join(digests).hex().encode('ascii')
+    return ''.join(map(DIGEST_ENCODINGS[digest_encoding], digests)).encode('ascii')
+
+
+def _unpack_digests(buffer, count, digest_encoding):
+    """_hash_packed의 버퍼를 값 count개짜리 object 배열(str, raw는 bytes)로 나누는 함수"""
+    width = len(buffer) // count
+    if digest_encoding == 'raw':
+        # 'S'는 끝의 0 바이트를 잘라내므로 raw 해시는 'V'로 나눈다
+        return np.frombuffer(buffer, dtype=f'V{width}').astype(object)
+    # 표기 결과는 ASCII이므로 바이트를 그대로 UCS-4 코드 포인트로 넓혀 한 번에 문자열로 만든다
+    return np.frombuffer(buffer, dtype=np.uint8).astype(np.uint32).view(f'U{width}').astype(object)
+
+
+def _hash_column(series, batch_func, digest_encoding='hex'):
+    # 같은 값은 한 번만 해싱한다 (도시, 생년월일처럼 중복이 많은 컬럼에서 효과가 큼)
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind in 'iu':
+        # 정수 컬럼은 고유값 배열 그대로 작업자에게 보내고 문자열 변환도 작업자에서 한다
+        codes, values = pd.factorize(series.to_numpy())
+    elif isinstance(series.dtype, pd.StringDtype):
+        codes, uniques = pd.factorize(series, use_na_sentinel=False)
+        values = list(uniques.to_numpy(dtype=object, na_value='nan'))
+    else:
+        codes, uniques = pd.factorize(_to_str(series))
+        values = list(uniques)
+    if HASH_WORKERS > 1 and len(values) >= PARALLEL_HASH_MIN_ROWS:
+        # 모든 작업자가 배치를 하나 이상 받도록 나눠 여러 프로세스에서 해싱한 뒤 원래 순서대로 이어 붙임.
+        # 입력은 배치마다 문자열 하나(또는 정수 배열)로, 결과는 표기까지 마친 버퍼 하나로 주고받고,
+        # 묶기/풀기는 배치 단위로 해서 작업자가 해싱하는 동안 부모 프로세스도 일한다.
+        batch_size = min(HASH_BATCH_SIZE, -(-len(values) // HASH_WORKERS))
+        starts = range(0, len(values), batch_size)
+        hash_packed = functools.partial(_hash_packed, batch_func, digest_encoding)
+        buffers = _get_hash_pool().map(hash_packed, (_pack_values(values[i:i + batch_size]) for i in starts))
+        encoded = np.empty(len(values), dtype=object)
+        for i, buffer in zip(starts, buffers):
+            batch = encoded[i:i + batch_size]
+            batch[:] = _unpack_digests(buffer, len(batch), digest_encoding)
+    else:
+        encode = DIGEST_ENCODINGS[digest_encoding]
+        encoded = np.empty(len(values), dtype=object)
+        encoded[:] = [encode(digest) for digest in batch_func(_str_values(values))]
+    if len(values) < len(series):
+        encoded = encoded[codes]  # 모든 값이 서로 다르면 codes는 0, 1, 2, ...이므로 그대로 쓴다
+    return pd.Series(encoded, index=series.index, name=series.name)
+
+
+def sha256_text_column(series, options=None):
+    digest_size, digest_encoding = _hash_options(options, 'sha256')
+    return _hash_column(series, functools.partial(_sha256_batch, digest_size=digest_size), digest_encoding)
+
+
+def _hash_secret(options):
+    secret = (options or {}).get('secret')
+    if not secret:
+        raise ValueError(f"A secret key is required for keyed hashing (set {HASH_SECRET_ENV} or enter one).")
+    return secret
+
+
+def _keyed_hash_column(series, options, algorithm):
+    secret = _hash_secret(options)
+    digest_size, digest_encoding = _hash_options(options, algorithm)
+    key = secret.encode() if isinstance(secret, str) else secret
+    return _hash_column(series, functools.partial(_keyed_hash_batch, algorithm, key, digest_size), digest_encoding)
+
+
+def hmac_sha256_column(series, options=None):
+    return _keyed_hash_column(series, options, 'hmac-sha256')
+
+
+def blake2b_keyed_column(series, options=None):
+    return _keyed_hash_column(series, options, 'blake2b')
+
+
+def mask_name_column(series, options=None):
+    name_str = _to_str(series)
+    length = name_str.str.len()
+    masked = np.select(
+        [length == 2, length == 3, length == 4],
+        [name_str.str[0] + "*", name_str.str[0] + "**", name_str.str[:2] + "**"],
+        default=name_str)
+    return pd.Series(masked, index=series.index, name=series.name, dtype=object).where(series.notna(), series)
+
+
+def mask_phone_column(series, options=None):
+    phone_str = _to_str(series)
+    return '0' + phone_str.str[:2] + '-' + '****' + '-' + phone_str.str[6:]
+
+
+AGE_BINS = [-np.inf, 20, 30, 40, 50, np.inf]  # 구간은 [왼쪽, 오른쪽)
+AGE_LABELS = ['10대', '20대', '30대', '40대', '50대 이상']
+
+
+def categorize_age_column(series, options=None):
+    # 한 작업 안에서는 같은 기준일로 나이를 계산한다
+    today = (options or {}).get('today') or pd.Timestamp.now()
+    return _transform_unique(series, lambda uniques: _categorize_age_unique(uniques, today))
+
+
+def _categorize_age_unique(series, today):
+    try:
+        # 값마다 형식을 따로 추론하므로 값 단위 pd.to_datetime과 같은 결과를 낸다
+        birthdate = pd.to_datetime(series, errors='coerce', format='mixed')
+    except (ValueError, TypeError):
+        # 시간대가 섞여 있는 등 한 번에 변환할 수 없는 경우
+        return series.apply(categorize_age, today=today)
+
+    before_birthday = (birthdate.dt.month > today.month) | (
+        (birthdate.dt.month == today.month) & (birthdate.dt.day > today.day))
+    age = today.year - birthdate.dt.year - before_birthday.astype(int)
+    buckets = pd.cut(age, bins=AGE_BINS, labels=AGE_LABELS, right=False).astype(object)
+    buckets = buckets.where(birthdate.notna(), 'Invalid Date')
+    return buckets.where(series.notna(), series)
+
+
+def mask_address_column(series, options=None):
+    return _transform_unique(series, _mask_address_unique)
+
+
+def _mask_address_unique(series):
+    address_str = _to_str(series)
+    parts = address_str.str.partition(' ')
+    masked = (parts[0] + " " + "****").where(parts[1] != '', address_str)
+    return masked.where(series.notna(), series).rename(series.name)
+
+
+def round_up_square_footage_column(series, options=None):
+    return np.ceil(series / 100) * 100
+
+
+def round_up_monthly_payment_column(series, options=None):
+    return np.ceil(series / 100000) * 100000
+
+
+# 단계별 시간/메모리 측정
+def peak_rss_bytes():
+    """현재 프로세스의 최대 RSS(바이트)를 반환하는 함수 (측정할 수 없으면 None)
+
+    Linux에서는 reset_peak_rss()로 초기화한 뒤의 최대값(VmHWM)이다.
+    """
+    try:
+        with open('/proc/self/status') as file:
+            for line in file:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # Linux는 KB 단위
+
+
+def current_rss_bytes():
+    """현재 프로세스의 RSS(바이트)를 반환하는 함수 (측정할 수 없으면 None)"""
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def reset_peak_rss():
+    """최대 RSS를 현재 RSS로 초기화하는 함수 (Linux 전용, 초기화했으면 True)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as file:
+            file.write('5')
+        return True
+    except OSError:
+        return False
+
+
+class StageTimer:
+    """작업의 단계(읽기, 컬럼별 변환, 저장 등)마다 wall/CPU 시간, 처리 행 수, RSS를 기록하는 클래스
+
+    RSS는 단계 시작/끝의 현재 값(rss_start, rss_end)과 단계 안에서의 최대값(peak_rss)을 기록한다.
+    최대값은 단계를 시작할 때 초기화하므로(Linux) 앞 단계의 최대값이 뒤 단계에 이어지지 않는다.
+    초기화할 수 없는 환경에서는 peak_rss가 프로세스 전체의 최대값이다.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.records = []
+        self.open_records = []  # 진행 중인 단계 (단계 안에서 다른 단계가 시작될 수 있음)
+
+    def _update_peaks(self):
+        # 최대 RSS를 초기화하기 전에 진행 중인 모든 단계의 최대값에 반영한다
+        peak = peak_rss_bytes()
+        if peak is not None:
+            for record in self.open_records:
+                record['peak_rss'] = max(record['peak_rss'] or 0, peak)
+
+    @contextlib.contextmanager
+    def stage(self, name, rows=None):
+        """with 블록 하나를 한 단계로 기록한다. 행 수를 나중에 알게 되면 record['rows']에 넣는다."""
+        record = {'stage': name, 'rows': rows, 'peak_rss': None}
+        self._update_peaks()
+        record['rss_start'] = current_rss_bytes()
+        reset_peak_rss()
+        self.open_records.append(record)
+        start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record['start'] = start - self.started
+            record['wall'] = time.perf_counter() - start
+            record['cpu'] = time.process_time() - cpu_start
+            self._update_peaks()
+            self.open_records.remove(record)
+            record['rss_end'] = current_rss_bytes()
+            self.records.append(record)
+
+    def summary(self):
+        """같은 이름의 단계(청크마다 반복되는 단계 등)를 합친 요약을 처음 나온 순서대로 반환한다"""
+        stages = {}
+        for record in self.records:
+            total = stages.setdefault(record['stage'], {
+                'stage': record['stage'], 'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'rows': 0, 'peak_rss': None,
+                'rss_change': None})
+            total['calls'] += 1
+            total['wall'] += record['wall']
+            total['cpu'] += record['cpu']
+            total['rows'] += record['rows'] or 0
+            if record['peak_rss'] is not None:
+                total['peak_rss'] = max(total['peak_rss'] or 0, record['peak_rss'])
+            if record['rss_start'] is not None and record['rss_end'] is not None:
+                total['rss_change'] = (total['rss_change'] or 0) + record['rss_end'] - record['rss_start']
+        return list(stages.values())
+
+    def format_summary(self):
+        lines = [f"{'stage':<40} {'calls':>6} {'wall(s)':>9} {'cpu(s)':>9} {'rows':>12} {'peak RSS':>10} "
+                 f"{'RSS change':>11}"]
+        for total in self.summary():
+            peak = f"{total['peak_rss'] / 1024 ** 2:.0f} MB" if total['peak_rss'] is not None else "-"
+            change = f"{total['rss_change'] / 1024 ** 2:+.0f} MB" if total['rss_change'] is not None else "-"
+            lines.append(f"{total['stage']:<40} {total['calls']:>6} {total['wall']:>9.3f} {total['cpu']:>9.3f} "
+                         f"{total['rows']:>12,} {peak:>10} {change:>11}")
+        return "\n".join(lines)
+
+    def export(self, path):
+        """기록을 파일로 저장한다. .jsonl이면 단계마다 한 줄씩, 그 밖에는 Chrome/Perfetto trace 형식으로 쓴다."""
+        with open(path, 'w', encoding='utf-8') as file:
+            if path.lower().endswith('.jsonl'):
+                for record in self.records:
+                    file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                return
+            events = [{'name': record['stage'], 'ph': 'X', 'pid': os.getpid(), 'tid': 0,
+                       'ts': record['start'] * 1e6, 'dur': record['wall'] * 1e6,
+                       'args': {name: record[name] for name in ('cpu', 'rows', 'peak_rss', 'rss_start', 'rss_end')}}
+                      for record in self.records]
+            json.dump({'traceEvents': events, 'summary': self.summary()}, file, ensure_ascii=False, indent=1)
+
+
+def timed_stage(timer, name, rows=None):
+    """timer가 있으면 timer.stage(), 없으면 아무것도 기록하지 않는 컨텍스트를 반환하는 함수"""
+    return timer.stage(name, rows) if timer is not None else contextlib.nullcontext({})
+
+
+def timed_chunks(chunks, timer, name='read'):
+    """청크를 하나씩 읽는 데 걸린 시간을 단계로 기록하면서 청크를 넘겨주는 제너레이터"""
+    chunks = iter(chunks)
+    while True:
+        with timed_stage(timer, name) as record:
+            chunk = next(chunks, None)
+            if chunk is not None:
+                record['rows'] = len(chunk)
+        if chunk is None:
+            return
+        yield chunk
+
+
+# 비식별화 방법 이름 -> 컬럼 단위 함수
+ANONYMIZATION_METHODS = {
+    "Replace with **": mask_name_column,
+    "Replace with ***": mask_name_column,
+    "SHA-256 Encrypt": sha256_text_column,
+    "HMAC-SHA256": hmac_sha256_column,
+    "BLAKE2b Keyed": blake2b_keyed_column,
+    "Mask Phone": mask_phone_column,
+    "Categorize Age": categorize_age_column,
+    "Mask Address": mask_address_column,
+    "Round Up Square Footage": round_up_square_footage_column,
+    "Round Up Monthly Payment": round_up_monthly_payment_column,
+}
+
+
+def new_job_options(secret=None, digest_size=None, digest_encoding='hex', timer=None):
+    """작업 하나에서 모든 컬럼/청크가 공유하는 옵션을 만드는 함수
+
+    secret이 없으면 환경 변수 ANONYMIZER_SECRET의 값을 키 기반 해싱의 비밀 키로 사용한다.
+    timer(StageTimer)가 주어지면 복사, 컬럼별 변환 등의 단계가 기록된다.
+    """
+    return {'today': pd.Timestamp.now(),
+            'secret': secret or os.environ.get(HASH_SECRET_ENV),
+            'digest_size': digest_size or DEFAULT_DIGEST_SIZE,
+            'digest_encoding': digest_encoding,
+            'timer': timer}
+
+
+def anonymize_dataframe(df, settings, options=None, progress=None):
+    """설정(컬럼 -> 비식별화 방법 또는 {'method': 방법, 파라미터...})에 따라 비식별화된 DataFrame을 반환하는 함수
+
+    progress가 주어지면 컬럼 하나를 처리할 때마다 progress(완료 컬럼 수, 전체 컬럼 수)를 호출한다.
+    """
+    return compile_plan(settings, options).apply(df, progress)
+
+
+# 비식별화 프로필 (컬럼 -> 방법과 파라미터)과 실행 계획
+PROFILE_VERSION = 1
+HASH_METHOD_ALGORITHMS = {
+    "SHA-256 Encrypt": 'sha256',
+    "HMAC-SHA256": 'hmac-sha256',
+    "BLAKE2b Keyed": 'blake2b',
+}
+# 방법별로 프로필에서 컬럼마다 따로 지정할 수 있는 파라미터 (지정하지 않으면 작업 옵션을 따름)
+METHOD_PARAMETERS = {method: ('digest_size', 'digest_encoding') for method in HASH_METHOD_ALGORITHMS}
+
+PlanStep = collections.namedtuple('PlanStep', ['column', 'method', 'func', 'options'])
+
+
+def _column_spec(spec):
+    """프로필의 컬럼 설정('방법' 또는 {'method': 방법, 파라미터...})을 (방법, 파라미터)로 나누는 함수"""
+    if isinstance(spec, str):
+        return spec, {}
+    params = dict(spec)
+    return params.pop('method', None), params
+
+
+def load_profile(path):
+    """JSON 프로필 파일을 읽어 컬럼 설정(컬럼 -> 방법 또는 {'method': ..., 파라미터})을 반환하는 함수"""
+    with open(path, encoding='utf-8') as file:
+        profile = json.load(file)
+    if not isinstance(profile, dict) or not isinstance(profile.get('columns'), dict):
+        raise ValueError(f"{path} is not an anonymization profile (missing 'columns')")
+    if profile.get('version', PROFILE_VERSION) > PROFILE_VERSION:
+        raise ValueError(f"{path} was written by a newer version (profile version {profile['version']})")
+    return profile['columns']
+
+
+def save_profile(path, settings):
+    """컬럼 설정을 JSON 프로필 파일로 저장하는 함수 (비밀 키는 저장하지 않는다)"""
+    check_settings(settings)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({'version': PROFILE_VERSION, 'columns': settings}, file, ensure_ascii=False, indent=2)
+
+
+class AnonymizationPlan:
+    """컬럼마다 실행할 함수와 옵션을 미리 정해 둔 실행 계획
+
+    compile_plan으로 한 번 만들어 두면 여러 청크와 파일에 그대로 적용할 수 있다.
+    """
+
+    def __init__(self, steps, timer=None):
+        self.steps = steps
+        self.timer = timer
+
+    def apply(self, df, progress=None):
+        """계획을 df에 적용한 새 DataFrame을 반환한다
+
+        변환하지 않는 컬럼은 복사하지 않고, 변환된 컬럼만 새 DataFrame에 바꿔 넣는다.
+        progress가 주어지면 컬럼 하나를 처리할 때마다 progress(완료 컬럼 수, 전체 컬럼 수)를 호출한다.
+        """
+        missing = [step.column for step in self.steps if step.column not in df.columns]
+        if missing:
+            raise ValueError(f"columns not found in the input: {missing}")
+        transformed = {}
+        for i, step in enumerate(self.steps):
+            with timed_stage(self.timer, f"transform:{step.column} ({step.method})", len(df)):
+                transformed[step.column] = step.func(df[step.column], step.options)
+            if progress is not None:
+                progress(i + 1, len(self.steps))
+        df_anonymized = df.copy(deep=False)
+        for column, values in transformed.items():
+            df_anonymized[column] = values
+        return df_anonymized
+
+
+def check_settings(settings):
+    """비밀 키와 상관없이 컬럼 설정의 방법과 파라미터가 올바른지 검사하는 함수 (잘못되면 ValueError)"""
+    compile_plan(settings, {'secret': 'placeholder'})
+
+
+def compile_plan(settings, options=None):
+    """컬럼 설정을 검사하고 방법별 함수와 옵션을 미리 정한 AnonymizationPlan을 반환하는 함수
+
+    알 수 없는 방법, 허용되지 않는 파라미터, 키 기반 해싱에 필요한 비밀 키가 없는 경우
+    데이터를 읽기 전에 ValueError가 발생한다.
+    """
+    if options is None:
+        options = new_job_options()
+    steps = []
+    for column, spec in settings.items():
+        method, params = _column_spec(spec)
+        column_func = ANONYMIZATION_METHODS.get(method)
+        if column_func is None:
+            raise ValueError(f"unknown anonymization method {method!r} for column {column!r}")
+        unknown = set(params) - set(METHOD_PARAMETERS.get(method, ()))
+        if unknown:
+            raise ValueError(f"{method} does not accept parameters {sorted(unknown)} (column {column!r})")
+        column_options = {**options, **params}
+        algorithm = HASH_METHOD_ALGORITHMS.get(method)
+        if algorithm is not None:
+            _hash_options(column_options, algorithm)
+            if algorithm != 'sha256':
+                _hash_secret(column_options)
+        steps.append(PlanStep(column, method, column_func, column_options))
+    return AnonymizationPlan(steps, options.get('timer'))
+
+
+# 스트리밍(청크 단위) 비식별화
+CHUNK_SIZE = 100000  # 한 번에 읽는 행 수
+STREAMING_THRESHOLD_BYTES = 256 * 1024 * 1024  # 이보다 큰 파일은 청크 단위로 처리
+
+
+def _common_dtype(dtypes):
+    """청크별 dtype을 파일 전체를 한 번에 읽었을 때의 dtype으로 합치는 함수"""
+    dtypes = set(dtypes)
+    if len(dtypes) == 1:
+        return dtypes.pop()
+    if all(pd.api.types.is_integer_dtype(d) or pd.api.types.is_float_dtype(d) for d in dtypes):
+        return np.dtype('float64')
+    # 문자열이 섞인 컬럼은 한 번에 읽을 때처럼 문자열 dtype(pandas 3의 str)으로 읽는다 (이전 버전은 object)
+    string_dtypes = {d for d in dtypes if isinstance(d, pd.StringDtype)}
+    if len(string_dtypes) == 1:
+        return string_dtypes.pop()
+    return object
+
+
+def _scan_dtypes(file_path, encoding, chunksize, on_chunk=None):
+    chunk_dtypes = {}
+    rows = 0
+    for chunk in iter_table_chunks(file_path, chunksize, encoding):
+        if on_chunk is not None:
+            on_chunk(chunk)
+        for column, dtype in chunk.dtypes.items():
+            chunk_dtypes.setdefault(column, []).append(dtype)
+        rows += len(chunk)
+    return {column: _common_dtype(dtypes) for column, dtypes in chunk_dtypes.items()}, rows
+
+
+def _scan_columnar(file_path):
+    """Parquet/Feather 파일의 dtype과 행 수를 데이터를 읽지 않고 메타데이터에서 구하는 함수"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if input_format(file_path) == 'parquet':
+        parquet_file = pq.ParquetFile(file_path)
+        schema, rows = parquet_file.schema_arrow, parquet_file.metadata.num_rows
+    else:
+        reader = pa.ipc.open_file(pa.memory_map(file_path))
+        schema = reader.schema
+        rows = sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+    return schema.empty_table().to_pandas().dtypes.to_dict(), rows
+
+
+def scan_csv(file_path, chunksize=CHUNK_SIZE, encoding=None, on_chunk=None):
+    """파일을 청크 단위로 한 번 훑어 인코딩, 컬럼별 dtype, 행 수를 구하는 함수
+
+    on_chunk가 주어지면 CSV를 훑는 동안 읽은 청크마다 on_chunk(청크)를 호출한다.
+    """
+    if input_format(file_path) != 'csv':
+        return None, *_scan_columnar(file_path)
+    if encoding is None:
+        encoding = detect_csv_encoding(file_path)
+    dtypes, rows = _scan_dtypes(file_path, encoding, chunksize, on_chunk)
+    return encoding, dtypes, rows
+
+
+def anonymize_csv_file(file_path, save_path, settings, chunksize=CHUNK_SIZE, encoding=None, progress=None,
+                       file_format=None, compression=None, options=None):
+    """CSV 파일을 청크 단위로 읽어 비식별화한 뒤 save_path에 이어서 쓰는 함수
+
+    메모리 사용량은 청크 크기에만 비례한다. 첫 번째 패스에서 파일 전체 기준의
+    dtype을 구해 두기 때문에 결과는 메모리에서 한 번에 처리한 것과 같다.
+    progress가 주어지면 청크마다 progress(처리한 행 수, 전체 행 수)를 호출한다.
+    결과 형식은 save_path의 확장자(또는 file_format)로 정해진다 (TableWriter 참고).
+    """
+    if options is None:
+        options = new_job_options()
+    plan = compile_plan(settings, options)
+    timer = options.get('timer')
+    if encoding is None:
+        encoding = detect_input_encoding(file_path, timer)
+    with timed_stage(timer, 'scan') as record:
+        encoding, dtypes, total_rows = scan_csv(file_path, chunksize, encoding)
+        record['rows'] = total_rows
+    rows = 0
+    with TableWriter(save_path, 'utf-8', file_format, compression) as writer:
+        for chunk in timed_chunks(iter_table_chunks(file_path, chunksize, encoding, dtypes), timer):
+            df_anonymized = plan.apply(chunk)
+            with timed_stage(timer, 'save', len(chunk)):
+                writer.write(df_anonymized)
+            rows += len(chunk)
+            if progress is not None:
+                progress(rows, total_rows)
+    return rows
+
+
+# 증분 비식별화 (지난 실행 이후 새로 생기거나 바뀐 행만 다시 변환)
+STATE_VERSION = 1
+STATE_SUFFIX = '.state.pkl'  # 상태 파일 기본 경로 = 결과 파일 경로 + STATE_SUFFIX
+DATE_DEPENDENT_METHODS = ("Categorize Age",)  # 실행 날짜에 따라 결과가 달라지는 방법 (날짜가 바뀌면 모든 행을 다시 계산)
+
+
+def row_fingerprints(df, key, secret=None):
+    """행마다 (행 키 해시, 내용 해시)를 uint64 배열로 반환하는 함수
+
+    행 키는 key 값과 같은 key 값 안에서의 순번으로 만들므로 key가 중복되어도 행마다 다르다.
+    내용 해시는 모든 컬럼의 값으로 만든다. 비트 패턴이 같으면(int 0과 float 0.0 등) dtype이 달라도 해시가 같으므로
+    dtype 변화는 따로 확인해야 한다. secret이 주어지면 해시 키를 secret에서 만들어,
+    상태 파일만으로는 원래 값을 대입해 맞춰 볼 수 없게 한다.
+    """
+    hash_key = None
+    if secret:
+        secret = secret.encode() if isinstance(secret, str) else secret
+        hash_key = hmac.new(secret, b'row fingerprint', hashlib.sha256).hexdigest()[:16]
+    occurrence = df.groupby(df[key], dropna=False, sort=False).cumcount()
+    row_keys = pd.util.hash_pandas_object(pd.DataFrame({'key': df[key], 'occurrence': occurrence}), index=False,
+                                          hash_key=hash_key)
+    return row_keys.to_numpy(), pd.util.hash_pandas_object(df, index=False, hash_key=hash_key).to_numpy()
+
+
+def _plan_signature(plan):
+    """상태 파일에 기록할 계획 요약 (컬럼, 방법, 해시 옵션, 비밀 키 확인값; 비밀 키 자체는 담지 않는다)"""
+    signature = []
+    for step in plan.steps:
+        entry = [step.column, step.method]
+        algorithm = HASH_METHOD_ALGORITHMS.get(step.method)
+        if algorithm is not None:
+            entry += [step.options.get('digest_size') or DEFAULT_DIGEST_SIZE,
+                      step.options.get('digest_encoding') or 'hex']
+            if algorithm != 'sha256':
+                secret = _hash_secret(step.options)
+                secret = secret.encode() if isinstance(secret, str) else secret
+                entry.append(hmac.new(secret, b'incremental state', hashlib.sha256).hexdigest()[:16])
+        signature.append(entry)
+    return signature
+
+
+def load_state(path):
+    """증분 비식별화 상태 파일을 읽어 (메타데이터, 행 DataFrame)을 반환하는 함수 (파일이 없으면 (None, None))
+
+    상태 파일은 {'meta': 메타데이터, 'rows': 비식별화 결과 + _row_key, _row_hash 컬럼} 레코드를 이어 쓴 것이며,
+    메타데이터는 마지막 레코드의 것을 사용한다.
+    """
+    records = list(_read_pickles(path))
+    if not records:
+        return None, None
+    return records[-1]['meta'], pd.concat([record['rows'] for record in records], ignore_index=True)
+
+
+def _write_state(path, meta, rows, append=False):
+    record = {'meta': meta, 'rows': rows}
+    if append:
+        _append_pickle(path, record)
+        return
+    # 쓰는 도중 실패해도 지난 상태 파일이 남도록 임시 파일에 쓴 뒤 바꾼다
+    temp_path = path + '.tmp'
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    _append_pickle(temp_path, record)
+    os.replace(temp_path, path)
+
+
+def format_incremental_summary(summary):
+    """anonymize_incremental 결과를 한 줄 문자열로 반환하는 함수"""
+    return (f"{summary['rows']:,} rows: {summary['new']:,} new, {summary['changed']:,} changed, "
+            f"{summary['unchanged']:,} unchanged, {summary['deleted']:,} deleted (output {summary['mode']})")
+
+
+def anonymize_incremental(file_path, save_path, key, settings, state_path=None, options=None, progress=None,
+                          file_format=None, compression=None):
+    """지난 실행의 상태와 비교해 새로 생기거나 바뀐 행만 비식별화하고 save_path를 다시 쓰거나 뒤에 이어 쓰는 함수
+
+    상태 파일(기본값: save_path + STATE_SUFFIX)에는 행 키 해시 -> 내용 해시와 그 행의 비식별화 결과가 저장된다.
+    바뀌지 않은 행은 지난 결과를 그대로 쓰므로 변환(해싱 등)에 드는 시간은 바뀐 행 수에 비례한다.
+    상태 파일이 없거나 key, 입력 컬럼과 dtype, 설정, 해시 옵션, 비밀 키, 결과 경로가 지난 실행과 다르면 모든 행을 변환한다.
+    DATE_DEPENDENT_METHODS 컬럼은 실행 날짜가 바뀌면 모든 행을 다시 계산한다.
+    지난 행이 순서대로 모두 그대로 있고 뒤에 새 행만 붙었으면 CSV 결과는 다시 쓰지 않고 새 행만 이어 쓴다.
+    progress가 주어지면 바뀐 행의 컬럼 하나를 처리할 때마다 progress(완료 컬럼 수, 전체 컬럼 수)를 호출한다.
+    전체/새/바뀐/그대로/삭제된 행 수와 저장 방식('full', 'rewritten', 'appended', 'unchanged')을 dict로 반환한다.
+    """
+    if options is None:
+        options = new_job_options()
+    plan = compile_plan(settings, options)
+    timer = options.get('timer')
+    state_path = state_path or save_path + STATE_SUFFIX
+    encoding = detect_input_encoding(file_path, timer)
+    with timed_stage(timer, 'load') as record:
+        df = read_table(file_path, encoding=encoding)
+        record['rows'] = len(df)
+    if key not in df.columns:
+        raise ValueError(f"key column {key!r} not found in {file_path}")
+    with timed_stage(timer, 'fingerprint', len(df)):
+        row_keys, row_hashes = row_fingerprints(df, key, options.get('secret'))
+
+    meta = {'version': STATE_VERSION, 'key': key, 'columns': list(df.columns),
+            'dtypes': [str(dtype) for dtype in df.dtypes], 'plan': _plan_signature(plan),
+            'output': os.path.abspath(save_path), 'date': options['today'].strftime('%Y-%m-%d')}
+    with timed_stage(timer, 'load state') as record:
+        previous_meta, previous = load_state(state_path)
+        if previous_meta is not None and any(previous_meta.get(name) != meta[name]
+                                             for name in ('version', 'key', 'columns', 'dtypes', 'plan', 'output')):
+            previous = None
+        record['rows'] = len(previous) if previous is not None else 0
+    positions = np.full(len(df), -1)
+    unchanged = np.zeros(len(df), dtype=bool)
+    if previous is not None:
+        previous_keys = pd.Index(previous['_row_key'])
+        if previous_keys.is_unique:
+            positions = previous_keys.get_indexer(row_keys)
+            found = positions >= 0
+            unchanged[found] = previous['_row_hash'].to_numpy()[positions[found]] == row_hashes[found]
+        else:
+            # 64비트 해시가 충돌한 상태 파일은 쓰지 않는다
+            previous = None
+
+    # 바뀐 행만 변환하고, 그대로인 행은 지난 결과를 가져와 입력 순서대로 합친다
+    date_steps = [step for step in plan.steps if step.method in DATE_DEPENDENT_METHODS]
+    redate = bool(date_steps) and previous is not None and previous_meta.get('date') != meta['date']
+    pieces = []
+    if unchanged.any():
+        kept = previous.iloc[positions[unchanged]][meta['columns']]
+        kept.index = df.index[unchanged]
+        for step in date_steps if redate else ():
+            with timed_stage(timer, f"transform:{step.column} ({step.method})", len(kept)):
+                kept[step.column] = step.func(df.loc[unchanged, step.column], step.options)
+        pieces.append(kept)
+    if not unchanged.all() or not pieces:
+        pieces.append(plan.apply(df[~unchanged], progress))
+    output = pd.concat(pieces).sort_index() if len(pieces) > 1 else pieces[0]
+
+    previous_rows = len(previous) if previous is not None else 0
+    append = (previous is not None and not redate and output_format(save_path, file_format) == 'csv'
+              and len(df) >= previous_rows and unchanged[:previous_rows].all() and (positions[:previous_rows] == np.arange(previous_rows)).all()
+              and os.path.exists(save_path) and os.path.getsize(save_path) == previous_meta.get('output_size'))
+    written = output.iloc[previous_rows:] if append else output
+    if not append or len(written):
+        with timed_stage(timer, 'save', len(written)):
+            with TableWriter(save_path, 'utf-8', file_format, compression, append=append) as writer:
+                writer.write(written)
+        meta['output_size'] = os.path.getsize(save_path)
+        state_rows = written.copy(deep=False)
+        state_rows['_row_key'] = row_keys[previous_rows:] if append else row_keys
+        state_rows['_row_hash'] = row_hashes[previous_rows:] if append else row_hashes
+        _write_state(state_path, meta, state_rows, append)
+
+    found = positions >= 0
+    return {
+        'rows': len(df),
+        'new': int((~found).sum()),
+        'changed': int((found & ~unchanged).sum()),
+        'unchanged': int(unchanged.sum()),
+        'deleted': previous_rows - int(found.sum()),
+        'mode': 'full' if previous is None else 'rewritten' if not append else 'appended' if len(written) else 'unchanged',
+    }
+
+
+# 여러 파일 일괄 비식별화 (같은 설정을 디렉터리/패턴의 모든 파일에 적용)
+BATCH_JOBS = min(4, os.cpu_count() or 1)  # 동시에 처리하는 파일 수 (메모리 사용량은 파일 수 x 청크 크기)
+BATCH_SUFFIX = '_anonymized'
+COMPRESSED_EXTENSIONS = ('.gz', '.bz2', '.xz', '.zst', '.zip')
+FORMAT_EXTENSIONS = {'csv': '.csv', 'parquet': '.parquet', 'feather': '.feather'}
+
+
+def is_input_file(file_path):
+    """디렉터리에서 일괄 처리할 입력 파일(CSV, 압축 CSV, Parquet, Feather)인지 판단하는 함수"""
+    name = os.path.basename(file_path).lower()
+    base, ext = os.path.splitext(name)
+    if ext in COMPRESSED_EXTENSIONS:
+        base, ext = os.path.splitext(base)
+    return ext == '.csv' or ext in INPUT_FORMATS
+
+
+def expand_inputs(patterns, skip_suffix=BATCH_SUFFIX):
+    """디렉터리 또는 glob 패턴 목록을 입력 파일 경로 목록으로 펼치는 함수 (중복 제거, 순서 유지)
+
+    디렉터리에서는 이전 일괄 처리 결과(이름이 skip_suffix로 끝나는 파일)를 입력으로 다시 고르지 않는다.
+    """
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            candidates = [os.path.join(pattern, name) for name in sorted(os.listdir(pattern))]
+            candidates = [path for path in candidates if is_input_file(path)
+                          and not (skip_suffix and _file_stem(path).endswith(skip_suffix))]
+        else:
+            candidates = sorted(glob.glob(pattern)) or [pattern]
+        files.extend(path for path in candidates if os.path.isfile(path) and path not in files)
+    return files
+
+
+def _file_stem(file_path):
+    """확장자(압축 확장자 포함)를 뗀 파일 이름을 반환하는 함수 (a.csv.gz -> a)"""
+    stem, ext = os.path.splitext(os.path.basename(file_path))
+    if ext.lower() in COMPRESSED_EXTENSIONS:
+        stem = os.path.splitext(stem)[0]
+    return stem
+
+
+def batch_output_path(file_path, out_dir=None, file_format=None, suffix=BATCH_SUFFIX):
+    """입력 파일 옆(또는 out_dir)에 저장할 결과 파일 경로를 만드는 함수 (a.csv.gz -> a_anonymized.csv)"""
+    ext = FORMAT_EXTENSIONS[file_format or input_format(file_path)]
+    return os.path.join(out_dir or os.path.dirname(file_path), _file_stem(file_path) + suffix + ext)
+
+
+def _anonymize_batch_file(file_path, save_path, settings, options, chunksize, file_format, compression):
+    """일괄 처리에서 파일 하나를 비식별화하고 manifest 항목을 반환하는 함수 (작업 프로세스에서 실행)"""
+    timer = StageTimer()
+    entry = {'input': file_path, 'output': save_path}
+    start = time.perf_counter()
+    try:
+        rows = anonymize_csv_file(file_path, save_path, settings, chunksize=chunksize, file_format=file_format,
+                                  compression=compression, options=dict(options, timer=timer))
+        entry.update(status='ok', rows=rows)
+    except Exception as e:
+        entry.update(status='error', rows=None, error=f"{type(e).__name__}: {e}")
+        # 중간까지 쓰인 결과 파일은 남기지 않는다
+        if os.path.exists(save_path):
+            os.remove(save_path)
+    entry['seconds'] = round(time.perf_counter() - start, 3)
+    entry['stages'] = timer.summary()
+    return entry
+
+
+def anonymize_batch(files, settings, out_dir=None, options=None, jobs=BATCH_JOBS, chunksize=CHUNK_SIZE,
+                    file_format=None, compression=None, suffix=BATCH_SUFFIX, progress=None):
+    """여러 파일에 같은 설정을 적용해 비식별화하고 파일별 결과(manifest 항목) 목록을 반환하는 함수
+
+    파일마다 청크 단위로 처리하므로 메모리 사용량은 동시에 처리하는 파일 수(jobs) x 청크 크기에 비례한다.
+    jobs가 2 이상이면 파일을 프로세스 풀에서 나눠 처리한다. 한 파일이 실패해도 나머지는 계속 처리하며,
+    실패한 파일은 status가 'error'인 항목으로 남는다. progress가 주어지면 파일 하나가 끝날 때마다
+    progress(끝난 파일 수, 전체 파일 수)를 호출하고, progress가 예외를 던지면 남은 파일은 취소된다.
+    """
+    if options is None:
+        options = new_job_options()
+    options = {name: value for name, value in options.items() if name != 'timer'}
+    # 설정 오류(비밀 키 누락 등)는 파일을 처리하기 전에 한 번만 알린다
+    compile_plan(settings, options)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    outputs = [batch_output_path(path, out_dir, file_format, suffix) for path in files]
+    duplicates = sorted({path for path in outputs if outputs.count(path) > 1})
+    if duplicates:
+        raise ValueError(f"several inputs would be written to the same output: {duplicates}")
+
+    entries = [None] * len(files)
+    if jobs <= 1 or len(files) <= 1:
+        for i, (file_path, save_path) in enumerate(zip(files, outputs)):
+            entries[i] = _anonymize_batch_file(file_path, save_path, settings, options, chunksize,
+                                               file_format, compression)
+            if progress is not None:
+                progress(i + 1, len(files))
+        return entries
+
+    # 작업 프로세스 안에서 다시 해싱용 프로세스 풀을 만들지 않도록 한다
+    with ProcessPoolExecutor(max_workers=jobs, initializer=set_hash_workers, initargs=(1,)) as pool:
+        futures = {pool.submit(_anonymize_batch_file, file_path, save_path, settings, options, chunksize,
+                               file_format, compression): i
+                   for i, (file_path, save_path) in enumerate(zip(files, outputs))}
+        try:
+            for done, future in enumerate(as_completed(futures), start=1):
+                entries[futures[future]] = future.result()
+                if progress is not None:
+                    progress(done, len(files))
+        except BaseException:
+            pool.shutdown(cancel_futures=True)
+            raise
+    return entries
+
+
+def write_manifest(path, entries, settings):
+    """일괄 처리 결과를 JSON manifest로 저장하는 함수"""
+    finished = [entry for entry in entries if entry is not None]
+    manifest = {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'settings': settings,
+        'files': finished,
+        'total': {
+            'files': len(finished),
+            'succeeded': sum(entry['status'] == 'ok' for entry in finished),
+            'failed': sum(entry['status'] != 'ok' for entry in finished),
+            'rows': sum(entry['rows'] or 0 for entry in finished),
+            'seconds': round(sum(entry['seconds'] for entry in finished), 3),
+        },
+    }
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, ensure_ascii=False, indent=2)
+    return manifest
+
+
+# 대용량 병합 (키 해시로 디스크에 분할한 뒤 파티션별로 병합)
+MERGE_PARTITION_BYTES = 64 * 1024 * 1024  # 파티션 하나에 들어갈 입력 크기 목표
+
+
+def _append_pickle(path, obj):
+    with open(path, 'ab') as file:
+        pickle.dump(obj, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _read_pickles(path):
+    """_append_pickle로 이어 쓴 객체들을 차례로 읽어 반환하는 함수"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb') as file:
+        while True:
+            try:
+                yield pickle.load(file)
+            except EOFError:
+                return
+
+
+def _empty_frame(dtypes):
+    return pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in dtypes.items()})
+
+
+def _partition_csv(file_path, encoding, dtypes, key, partitions, spill_dir, prefix, chunksize, advance, timer=None):
+    """CSV를 청크 단위로 읽어 key 해시값에 따라 파티션 파일로 나눠 쓰는 함수 (dtypes에 있는 컬럼만 읽음)"""
+    chunks = iter_table_chunks(file_path, chunksize, encoding, dtypes, columns=list(dtypes))
+    for chunk in timed_chunks(chunks, timer):
+        with timed_stage(timer, 'partition', len(chunk)):
+            partition_ids = pd.util.hash_pandas_object(chunk[key], index=False).to_numpy() % partitions
+            for partition_id, part in chunk.groupby(partition_ids, sort=False):
+                _append_pickle(os.path.join(spill_dir, f"{prefix}_{partition_id}.pkl"), part)
+        advance(len(chunk))
+
+
+def _merge_partitioned(file_paths, scans, key, how, partitions, spill_dir, chunksize, advance, timer):
+    """입력을 key 해시값으로 파티션 파일에 나눠 쓴 뒤 파티션별 병합 결과를 차례로 반환하는 제너레이터"""
+    for i, (path, (encoding, dtypes, _)) in enumerate(zip(file_paths, scans)):
+        _partition_csv(path, encoding, dtypes, key, partitions, spill_dir, f'input{i}', chunksize, advance, timer)
+
+    for partition_id in range(partitions):
+        with timed_stage(timer, 'merge') as record:
+            parts = [list(_read_pickles(os.path.join(spill_dir, f"input{i}_{partition_id}.pkl")))
+                     for i in range(len(file_paths))]
+            if not any(parts):
+                continue
+            frames = [pd.concat(part) if part else _empty_frame(dtypes)
+                      for part, (_, dtypes, _) in zip(parts, scans)]
+            merged = merge_many(frames, key, how)
+            record['rows'] = sum(len(frame) for frame in frames)
+        advance(record['rows'])
+        yield merged
+
+
+def _merge_sorted_streams(file_paths, scans, key, how, chunksize, advance, timer):
+    """key 기준으로 정렬된 입력들을 청크 단위로 나란히 읽으며 병합 결과를 차례로 반환하는 제너레이터
+
+    모든 입력에서 읽은 마지막 key 중 가장 작은 값(경계)보다 작은 key는 더 나올 수 없으므로
+    그 행들만 병합하고 나머지는 다음 청크와 함께 처리한다. 파티션 파일을 쓰지 않으며 해시 분할도 하지 않는다.
+    결측 key 행은 따로 모아 마지막에 병합한다. 정렬되지 않은 입력을 만나면 ValueError가 발생한다.
+    """
+    readers = [timed_chunks(iter_table_chunks(path, chunksize, encoding, dtypes, columns=list(dtypes)), timer)
+               for path, (encoding, dtypes, _) in zip(file_paths, scans)]
+    buffers = [_empty_frame(dtypes) for _, dtypes, _ in scans]
+    missing = [[] for _ in file_paths]
+    last_keys = [None] * len(file_paths)
+    exhausted = [False] * len(file_paths)
+    refill = range(len(file_paths))
+    while True:
+        # 결측이 아닌 key가 있는 청크를 읽거나 입력이 끝날 때까지 읽는다
+        for i in refill:
+            while True:
+                chunk = next(readers[i], None)
+                if chunk is None:
+                    exhausted[i] = True
+                    break
+                advance(len(chunk))
+                if chunk[key].hasnans:
+                    missing[i].append(chunk[chunk[key].isna()])
+                    chunk = chunk[chunk[key].notna()]
+                if chunk.empty:
+                    continue
+                keys = chunk[key]
+                if not keys.is_monotonic_increasing or (last_keys[i] is not None and keys.iloc[0] < last_keys[i]):
+                    raise ValueError(f"{file_paths[i]} is not sorted by {key!r}")
+                last_keys[i] = keys.iloc[-1]
+                buffers[i] = pd.concat([buffers[i], chunk]) if len(buffers[i]) else chunk
+                break
+
+        active = [i for i in range(len(file_paths)) if not exhausted[i]]
+        with timed_stage(timer, 'merge') as record:
+            if active:
+                boundary = min(last_keys[i] for i in active)
+                ends = [buffer[key].searchsorted(boundary) for buffer in buffers]
+            else:
+                ends = [len(buffer) for buffer in buffers]
+            ready = [buffer.iloc[:end] for buffer, end in zip(buffers, ends)]
+            buffers = [buffer.iloc[end:] for buffer, end in zip(buffers, ends)]
+            record['rows'] = sum(len(frame) for frame in ready)
+            pieces = [merge_many(ready, key, how)] if record['rows'] else []
+            if not active and any(missing):
+                # 모든 입력을 다 읽었으면 결측 key 행끼리 병합
+                frames = [pd.concat(parts) if parts else _empty_frame(dtypes)
+                          for parts, (_, dtypes, _) in zip(missing, scans)]
+                record['rows'] += sum(len(frame) for frame in frames)
+                pieces.append(merge_many(frames, key, how))
+        yield from pieces
+        if not active:
+            return
+        # 마지막 key가 경계와 같은 입력만 더 읽는다 (나머지 입력의 버퍼에는 경계보다 큰 key가 남아 있음)
+        refill = [i for i in active if last_keys[i] == boundary]
+
+
+class _KeyOrderCheck:
+    """청크를 차례로 받아 key 컬럼이 지금까지 오름차순인지 기록하는 클래스 (결측 key는 무시)"""
+
+    def __init__(self, key):
+        self.key = key
+        self.last = None
+        self.sorted = True
+
+    def __call__(self, chunk):
+        if not self.sorted or self.key not in chunk.columns:
+            self.sorted = False
+            return
+        keys = chunk[self.key].dropna()
+        if keys.empty:
+            return
+        try:
+            if not keys.is_monotonic_increasing or (self.last is not None and keys.iloc[0] < self.last):
+                self.sorted = False
+                return
+        except TypeError:
+            # 문자열과 숫자가 섞인 key는 비교할 수 없으므로 정렬되지 않은 것으로 본다
+            self.sorted = False
+            return
+        self.last = keys.iloc[-1]
+
+
+def is_sorted_by_key(file_path, key, chunksize=None, encoding=None):
+    """파일이 key 기준 오름차순으로 정렬되어 있는지 key 컬럼만 청크 단위로 읽어 확인하는 함수 (결측 key는 무시)"""
+    check = _KeyOrderCheck(key)
+    chunks = iter_table_chunks(file_path, chunksize or CHUNK_SIZE, encoding, columns=[key])
+    try:
+        for chunk in chunks:
+            check(chunk)
+            if not check.sorted:
+                break
+    finally:
+        chunks.close()
+    return check.sorted
+
+
+def merge_files(file_paths, key, save_path, partitions=None, chunksize=CHUNK_SIZE, progress=None,
+                file_format=None, compression=None, timer=None, how='outer', presorted=None):
+    """여러 파일을 메모리에 모두 올리지 않고 key 기준으로 한 번에 how 방식으로 join하여 save_path에 쓰는 함수
+
+    모든 입력을 key의 해시값으로 같은 수의 파티션 파일로 나눈 뒤 파티션마다 N개 입력을 함께
+    병합하므로(merge_many), 중간 병합 결과를 파일로 쓰고 다시 읽지 않으며 메모리 사용량은
+    파티션 하나의 크기에 비례한다. 행 순서는 파티션 단위로 묶이며, 컬럼 dtype(결측으로 int가
+    float이 되는 경우 등)은 전체를 한 번에 병합했을 때와 같게 맞춘다.
+    입력이 모두 key로 정렬되어 있으면(presorted=True로 알려 주거나, None일 때 key 컬럼만 읽어 확인)
+    분할하지 않고 입력을 나란히 읽으며 정렬 병합한다. semi/anti는 두 번째 입력부터 key 컬럼만 읽는다.
+    progress가 주어지면 progress(처리한 입력 행 수, 전체 입력 행 수 x 2)를 호출한다 (분할 + 병합).
+    timer(StageTimer)가 주어지면 스캔, 분할, 병합, 저장 단계가 기록된다.
+    """
+    if len(file_paths) < 2:
+        raise ValueError("at least two files are needed for a merge")
+    if how not in JOIN_TYPES:
+        raise ValueError(f"unknown join type {how!r}; expected one of: {', '.join(JOIN_TYPES)}")
+    # 정렬 여부를 알려 주지 않았으면 CSV는 스캔하면서 key 순서를 함께 확인한다
+    checks = [_KeyOrderCheck(key) if presorted is None and input_format(path) == 'csv' else None
+              for path in file_paths]
+    encodings = [detect_input_encoding(path, timer) for path in file_paths]
+    with timed_stage(timer, 'scan') as record:
+        scans = [scan_csv(path, chunksize, encoding, on_chunk=check)
+                 for path, check, encoding in zip(file_paths, checks, encodings)]
+        record['rows'] = sum(rows for _, _, rows in scans)
+    for (_, dtypes, _), path in zip(scans, file_paths):
+        if key not in dtypes:
+            raise ValueError(f"key column {key!r} not found in {path}")
+    # 같은 키 값이 모든 입력에서 같은 파티션에 들어가도록 key dtype을 통일
+    key_dtype = _common_dtype([dtypes[key] for _, dtypes, _ in scans])
+    for _, dtypes, _ in scans:
+        dtypes[key] = key_dtype
+    if how in ('semi', 'anti'):
+        scans = [scans[0]] + [(encoding, {key: key_dtype}, rows) for encoding, _, rows in scans[1:]]
+
+    # 숫자와 문자열이 섞인 key(object)는 비교할 수 없으므로 정렬 병합하지 않는다
+    if key_dtype == object:
+        presorted = False
+    elif presorted is None:
+        # Parquet/Feather는 key 컬럼만 읽어 확인
+        with timed_stage(timer, 'sort check'):
+            presorted = all(check.sorted if check is not None else is_sorted_by_key(path, key, chunksize)
+                            for path, check in zip(file_paths, checks))
+
+    if partitions is None:
+        total_bytes = sum(estimated_input_bytes(path) for path in file_paths)
+        partitions = max(1, -(-total_bytes // MERGE_PARTITION_BYTES))
+
+    done = 0
+    # 정렬 병합은 입력을 한 번만 읽으므로 읽은 행 수를 두 번 센다
+    total = 2 * sum(rows for _, _, rows in scans)
+
+    def advance(rows):
+        nonlocal done
+        done += rows * (2 if presorted else 1)
+        if progress is not None:
+            progress(done, total)
+
+    with tempfile.TemporaryDirectory(prefix='csv_merge_') as spill_dir:
+        if presorted:
+            pieces = _merge_sorted_streams(file_paths, scans, key, how, chunksize, advance, timer)
+        else:
+            pieces = _merge_partitioned(file_paths, scans, key, how, partitions, spill_dir, chunksize, advance, timer)
+
+        # 병합 결과를 임시로 저장하면서 컬럼별 dtype을 모은다
+        merged_path = os.path.join(spill_dir, 'merged.pkl')
+        merged_dtypes = {}
+        for merged in pieces:
+            for column, dtype in merged.dtypes.items():
+                merged_dtypes.setdefault(column, []).append(dtype)
+            _append_pickle(merged_path, merged)
+
+        rows = 0
+        with TableWriter(save_path, 'utf-8-sig', file_format, compression) as writer:
+            if not merged_dtypes:
+                writer.write(merge_many([_empty_frame(dtypes) for _, dtypes, _ in scans], key, how))
+            for merged in _read_pickles(merged_path):
+                with timed_stage(timer, 'save', len(merged)):
+                    merged = merged.astype({column: _common_dtype(dtypes) for column, dtypes in merged_dtypes.items()})
+                    writer.write(merged)
+                rows += len(merged)
+    return rows
+
+
+def merge_csv_files(file_path1, file_path2, key, save_path, partitions=None, chunksize=CHUNK_SIZE, progress=None,
+                    file_format=None, compression=None, timer=None, how='outer', presorted=None):
+    """두 CSV 파일을 메모리에 모두 올리지 않고 key 기준으로 how 방식으로 join하여 save_path에 쓰는 함수 (merge_files 참고)"""
+    return merge_files([file_path1, file_path2], key, save_path, partitions, chunksize, progress,
+                       file_format, compression, timer, how, presorted)
+
+
 # CSV 파일 비식별화
 def anonymize_csv():
     if df_to_anonymize is not None and anonymization_settings:
@@ -222,53 +2122,185 @@ def anonymize_csv():
 
 
 def load_csv_for_anonymize():
-    global df_to_anonymize, anonymization_settings, anonymized_columns
-    file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
+    global df_to_anonymize, anonymize_file_path, anonymization_settings, anonymized_columns
+    file_path = filedialog.askopenfilename(filetypes=OPEN_FILETYPES)
     if file_path:
-        df_to_anonymize = load_csv(file_path)
+        # 컬럼 목록만 필요하므로 앞부분만 읽고, 전체 데이터는 비식별화를 실행할 때 읽는다
+        df_to_anonymize = load_csv(file_path, preview=True)
         if df_to_anonymize is not None:
+            anonymize_file_path = file_path
             # 목록 초기화 및 비식별화 설정 초기화
-            clear_anonymization_frame()
-
             anonymization_settings = {}
             anonymized_columns = []
+            settings_listbox.delete(0, tk.END)
+
+            # 컬럼 편집기는 화면에 보이는 줄만 위젯으로 만들므로 컬럼 수와 상관없이 바로 표시된다
+            column_editor.set_columns(df_to_anonymize.columns)
+
+
+class ColumnEditor(tk.Frame):
+    """컬럼마다 비식별화 방법을 고르는 스크롤 목록
+
+    컬럼 수와 상관없이 화면에 보이는 줄 수만큼의 위젯만 만들어 두고, 스크롤하거나 검색할 때
+    그 위젯에 표시할 컬럼만 바꿔 끼운다. 줄마다 고른 방법은 컬럼 이름 기준으로 기억한다.
+    """
+
+    ROW_HEIGHT = 30  # 한 줄의 높이 (픽셀), 보이는 줄 수 계산에 사용
+
+    def __init__(self, master, on_add):
+        super().__init__(master)
+        self.on_add = on_add
+        self.columns = []
+        self.filtered = []
+        self.selected = {}  # 컬럼 -> 콤보박스에서 고른 방법
+        self.first = 0  # 맨 위에 보이는 줄의 filtered 내 위치
+        self.rows = []
+
+        frame_search = tk.Frame(self)
+        frame_search.pack(side=tk.TOP, fill=tk.X)
+        tk.Label(frame_search, text="Search Columns:").pack(side=tk.LEFT, padx=5)
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add('write', lambda *args: self.apply_filter())
+        tk.Entry(frame_search, textvariable=self.search_var).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.count_label = tk.Label(frame_search, text="")
+        self.count_label.pack(side=tk.LEFT, padx=5)
+
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # 줄 위젯 수가 다시 높이를 바꾸지 않도록 body의 크기는 자식 위젯과 상관없이 정한다
+        self.body = tk.Frame(self, height=self.ROW_HEIGHT * 8)
+        self.body.pack_propagate(False)
+        self.body.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.body.bind('<Configure>', self.on_resize)
+        self.body.bind('<Enter>', self.bind_mousewheel)
+        self.body.bind('<Leave>', self.unbind_mousewheel)
+
+    def set_columns(self, columns):
+        self.columns = list(columns)
+        self.selected = {}
+        self.search_var.set('')
+        self.apply_filter()
+
+    def apply_filter(self):
+        text = self.search_var.get().strip().lower()
+        self.filtered = [column for column in self.columns if text in str(column).lower()]
+        self.first = 0
+        self.refresh()
+
+    def _make_row(self):
+        frame = tk.Frame(self.body, height=self.ROW_HEIGHT)
+        frame.pack_propagate(False)
+        frame.column = None
+        frame.label = tk.Label(frame, anchor='w', width=30)
+        frame.label.pack(side=tk.LEFT, padx=5)
+        frame.method_menu = ttk.Combobox(frame, state="readonly", values=list(ANONYMIZATION_METHODS))
+        frame.method_menu.pack(side=tk.LEFT, padx=5)
+        frame.method_menu.bind("<<ComboboxSelected>>",
+                               lambda event, row=frame: self.selected.__setitem__(row.column, row.method_menu.get()))
+        tk.Button(frame, text="Add", command=lambda row=frame: self.add(row)).pack(side=tk.LEFT, padx=5)
+        return frame
+
+    def on_resize(self, event):
+        # 보이는 줄 수가 바뀔 때만 위젯 수를 맞춘다
+        visible_rows = max(1, event.height // self.ROW_HEIGHT)
+        while len(self.rows) < visible_rows:
+            self.rows.append(self._make_row())
+        while len(self.rows) > visible_rows:
+            self.rows.pop().destroy()
+        self.refresh()
+
+    def refresh(self):
+        self.first = max(0, min(self.first, len(self.filtered) - len(self.rows)))
+        for i, row in enumerate(self.rows):
+            index = self.first + i
+            if index < len(self.filtered):
+                column = self.filtered[index]
+                row.column = column
+                row.label.config(text=column)
+                method = self.selected.get(column) or _column_spec(anonymization_settings.get(column, ''))[0]
+                row.method_menu.set(method or '')
+                row.pack(side=tk.TOP, fill=tk.X)
+            else:
+                row.column = None
+                row.pack_forget()
+        total = len(self.filtered)
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + len(self.rows)) / total))
+        else:
+            self.scrollbar.set(0, 1)
+        self.count_label.config(text=f"{total:,} / {len(self.columns):,} columns")
+
+    def on_scroll(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.first = int(float(amount) * len(self.filtered))
+        elif unit == 'pages':
+            self.first += int(amount) * len(self.rows)
+        else:
+            self.first += int(amount)
+        self.refresh()
 
-            for column in df_to_anonymize.columns:
-                # 각 속성에 대한 항목을 프레임에 추가
-                add_column_with_button(column)
+    def on_mousewheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.on_scroll('scroll', -3, 'units')
+        else:
+            self.on_scroll('scroll', 3, 'units')
 
-            # 비식별화할 속성만 모아서 CSV로 저장
-            save_anonymized_columns()
+    def bind_mousewheel(self, event):
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.body.bind_all(sequence, self.on_mousewheel)
 
+    def unbind_mousewheel(self, event):
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.body.unbind_all(sequence)
 
-def add_column_with_button(column):
-    frame = tk.Frame(anonymize_tab)
-    frame.pack(fill=tk.X, pady=2)
+    def add(self, row):
+        if row.column is not None:
+            self.on_add(row.column, row.method_menu.get())
 
-    label = tk.Label(frame, text=column)
-    label.pack(side=tk.LEFT, padx=5)
 
-    method_menu = ttk.Combobox(frame, state="readonly", values=[
-        "Replace with **", "Replace with ***", "SHA-256 Encrypt", "Mask Phone",
-        "Categorize Age", "Mask Address", "Round Up Square Footage", "Round Up Monthly Payment"])
-    method_menu.pack(side=tk.LEFT, padx=5)
+def add_column_for_anonymization(column_name, method):
+    if column_name and method:
+        anonymization_settings[column_name] = method
+        anonymized_columns.append(column_name)
+        settings_listbox.insert(tk.END, f"{column_name}: {method}")
 
-    button_add = tk.Button(frame, text="Add", command=lambda c=column: add_column_for_anonymization(c, method_menu))
-    button_add.pack(side=tk.LEFT, padx=5)
 
+PROFILE_FILETYPES = [("Anonymization profiles", "*.json"), ("All files", "*.*")]
 
-def clear_anonymization_frame():
-    for widget in anonymize_tab.winfo_children():
-        if isinstance(widget, tk.Frame):
-            widget.destroy()
 
+def load_anonymization_profile():
+    global anonymization_settings, anonymized_columns
+    profile_path = filedialog.askopenfilename(filetypes=PROFILE_FILETYPES)
+    if profile_path:
+        try:
+            settings = load_profile(profile_path)
+            check_settings(settings)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load the profile: {e}")
+            return
+        anonymization_settings = settings
+        anonymized_columns = list(settings)
+        settings_listbox.delete(0, tk.END)
+        for column, spec in settings.items():
+            settings_listbox.insert(tk.END, f"{column}: {_column_spec(spec)[0]}")
+        column_editor.refresh()
+        if df_to_anonymize is not None:
+            missing = [column for column in settings if column not in df_to_anonymize.columns]
+            if missing:
+                messagebox.showwarning("Warning", f"Columns not in the loaded file: {', '.join(map(str, missing))}")
 
-def add_column_for_anonymization(column_name, method_menu):
-    method = method_menu.get()
-    if column_name and method:
-        anonymization_settings[column_name] = method
-        anonymized_columns.append(column_name)
-        settings_listbox.insert(tk.END, f"{column_name}: {method}")
+
+def save_anonymization_profile():
+    if not anonymization_settings:
+        messagebox.showerror("Error", "Please add at least one column to anonymize first.")
+        return
+    profile_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=PROFILE_FILETYPES)
+    if profile_path:
+        try:
+            save_profile(profile_path, anonymization_settings)
+            messagebox.showinfo("Success", f"Profile saved successfully as {profile_path}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save the profile: {e}")
 
 
 # def save_anonymized_columns():
@@ -282,112 +2314,531 @@ def add_column_for_anonymization(column_name, method_menu):
 #                messagebox.showerror("Error", f"Failed to save the CSV file: {e}")
 
 
+def perform_batch_anonymization():
+    if not anonymization_settings:
+        messagebox.showerror("Error", "Please add at least one column to anonymize first.")
+        return
+    input_dir = filedialog.askdirectory(title="Folder with files to anonymize")
+    if not input_dir:
+        return
+    files = expand_inputs([input_dir])
+    if not files:
+        messagebox.showerror("Error", f"No CSV, Parquet or Feather files found in {input_dir}.")
+        return
+    settings = dict(anonymization_settings)
+    options = new_job_options(secret=secret_entry.get() or None)
+    try:
+        compile_plan(settings, options)
+    except ValueError as e:
+        messagebox.showerror("Error", str(e))
+        return
+    manifest_path = os.path.join(input_dir, 'batch_manifest.json')
+
+    def task(progress):
+        progress(0, len(files))
+        entries = anonymize_batch(files, settings, options=options, progress=progress)
+        manifest = write_manifest(manifest_path, entries, settings)
+        failed = [f"{os.path.basename(entry['input'])}: {entry['error']}"
+                  for entry in entries if entry['status'] != 'ok']
+        summary = f"{manifest['total']['succeeded']} of {len(files)} files, {manifest['total']['rows']:,} rows"
+        return "\n".join([summary] + failed)
+
+    run_in_background(task, manifest_path,
+                      f"Batch anonymization finished. Results are next to each file; summary in {manifest_path}",
+                      "Batch anonymization failed")
+
+
 def perform_anonymization():
     if df_to_anonymize is not None and anonymization_settings:
-        df_anonymized = df_to_anonymize.copy()
-
-        for column, method in anonymization_settings.items():
-            if method == "Replace with **":
-                df_anonymized[column] = df_anonymized[column].apply(mask_name)
-            elif method == "Replace with ***":
-                df_anonymized[column] = df_anonymized[column].apply(mask_name)
-            elif method == "SHA-256 Encrypt":
-                df_anonymized[column] = df_anonymized[column].apply(sha256_text)
-            elif method == "Mask Phone":
-                df_anonymized[column] = df_anonymized[column].apply(mask_phone)
-            elif method == "Categorize Age":
-                df_anonymized[column] = df_anonymized[column].apply(categorize_age)
-            elif method == "Mask Address":
-                df_anonymized[column] = df_anonymized[column].apply(mask_address)
-            elif method == "Round Up Square Footage":
-                df_anonymized[column] = df_anonymized[column].apply(round_up_square_footage)
-            elif method == "Round Up Monthly Payment":
-                df_anonymized[column] = df_anonymized[column].apply(round_up_monthly_payment)
-
-        save_path_anonymized = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
+        save_path_anonymized = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=SAVE_FILETYPES)
         if save_path_anonymized:
+            file_path, settings = anonymize_file_path, dict(anonymization_settings)
+            timer = StageTimer()
+            options = new_job_options(secret=secret_entry.get() or None, timer=timer)
             try:
-                df_anonymized.to_csv(save_path_anonymized, index=False)
-                messagebox.showinfo("Success", f"Anonymized CSV saved successfully as {save_path_anonymized}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to save the anonymized CSV file: {e}")
+                # 비밀 키 누락 등은 파일을 읽기 전에 알린다
+                compile_plan(settings, options)
+            except ValueError as e:
+                messagebox.showerror("Error", str(e))
+                return
+            row_key = None
+            if incremental_var.get():
+                row_key = ask_key_column(list(df_to_anonymize.columns), "Column identifying each row between runs:")
+                if not row_key:
+                    return
+
+            def task(progress):
+                if row_key:
+                    # 지난 실행 이후 새로 생기거나 바뀐 행만 변환
+                    summary = anonymize_incremental(file_path, save_path_anonymized, row_key, settings,
+                                                    options=options, progress=progress)
+                    return f"{format_incremental_summary(summary)}\n\n{timer.format_summary()}"
+                # 큰 파일은 메모리에 올리지 않고 원본 파일에서 청크 단위로 처리
+                if estimated_input_bytes(file_path) > STREAMING_THRESHOLD_BYTES:
+                    anonymize_csv_file(file_path, save_path_anonymized, settings, progress=progress, options=options)
+                else:
+                    progress(0, 0)
+                    encoding = detect_input_encoding(file_path, timer)
+                    with timer.stage('load') as record:
+                        df = read_table(file_path, encoding=encoding)
+                        if OPTIMIZE_DTYPES:
+                            df = optimize_dtypes(df)
+                        record['rows'] = len(df)
+                    df_anonymized = anonymize_dataframe(df, settings, options, progress=progress)
+                    with timer.stage('save', len(df_anonymized)):
+                        write_table(df_anonymized, save_path_anonymized, progress=progress)
+                return timer.format_summary()
+
+            run_in_background(task, save_path_anonymized,
+                              f"Anonymized CSV saved successfully as {save_path_anonymized}",
+                              "Failed to save the anonymized CSV file")
+
+
+# 백그라운드 작업 (GUI가 멈추지 않도록 병합/비식별화를 별도 스레드에서 실행)
+PROGRESS_POLL_MS = 100  # 진행 상황을 확인하는 주기
+background_executor = ThreadPoolExecutor(max_workers=1)
+progress_queue = queue.Queue()
+cancel_event = threading.Event()
+current_job = None
+output_before_job = None  # 작업 시작 전 결과 파일의 (수정 시각, 크기), 없었으면 None
+
+
+class OperationCancelled(Exception):
+    """사용자가 작업을 취소했을 때 발생하는 예외"""
+
+
+def report_progress(done, total):
+    """작업 스레드에서 호출되어 진행 상황을 큐에 넣고, 취소 요청이 있으면 작업을 중단하는 함수"""
+    if cancel_event.is_set():
+        raise OperationCancelled()
+    progress_queue.put((done, total))
+
+
+def run_in_background(task, save_path, success_message, error_message, on_success=None):
+    """task(progress)를 작업 스레드에서 실행하고 완료되면 결과를 메시지로 알리는 함수
+
+    task가 문자열(단계별 측정 요약 등)을 반환하면 완료 메시지 뒤에 덧붙인다.
+    on_success가 주어지면 완료 메시지 대신 메인 스레드에서 on_success(task 반환값)를 호출한다.
+    취소하면 save_path는 작업이 새로 만들었거나 다시 쓴 경우에만 지운다.
+    """
+    global current_job, output_before_job
+    if current_job is not None and not current_job.done():
+        messagebox.showerror("Error", "Another operation is still running.")
+        return
+    cancel_event.clear()
+    while not progress_queue.empty():
+        progress_queue.get_nowait()
+    set_busy(True)
+    output_before_job = _file_signature(save_path)
+    current_job = background_executor.submit(task, report_progress)
+    window.after(PROGRESS_POLL_MS, poll_background_job, save_path, success_message, error_message, on_success)
+
+
+def _file_signature(path):
+    if not path or not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def poll_background_job(save_path, success_message, error_message, on_success=None):
+    latest = None
+    while not progress_queue.empty():
+        latest = progress_queue.get_nowait()
+    if latest is not None:
+        done, total = latest
+        if total:
+            progress_bar.config(maximum=total, value=done)
+            status_label.config(text=f"{done:,} / {total:,}")
+        else:
+            status_label.config(text="Working...")
+
+    if not current_job.done():
+        window.after(PROGRESS_POLL_MS, poll_background_job, save_path, success_message, error_message, on_success)
+        return
+
+    set_busy(False)
+    try:
+        summary = current_job.result()
+    except OperationCancelled:
+        # 중간까지 쓰인 결과 파일은 남기지 않되, 아직 손대지 않은 지난 결과(증분 실행 등)는 그대로 둔다
+        if save_path and os.path.exists(save_path) and _file_signature(save_path) != output_before_job:
+            os.remove(save_path)
+        status_label.config(text="Cancelled")
+        messagebox.showinfo("Cancelled", "The operation was cancelled.")
+    except Exception as e:
+        status_label.config(text="Failed")
+        messagebox.showerror("Error", f"{error_message}: {e}")
+    else:
+        progress_bar.config(value=progress_bar['maximum'])
+        if on_success is not None:
+            on_success(summary)
+            return
+        status_label.config(text="Done")
+        if summary:
+            success_message = f"{success_message}\n\n{summary}"
+        messagebox.showinfo("Success", success_message)
+
+
+def cancel_background_job():
+    if current_job is not None and not current_job.done():
+        cancel_event.set()
+        status_label.config(text="Cancelling...")
+
+
+def set_busy(busy):
+    """작업 중에는 작업을 시작하는 버튼을 비활성화하고 취소 버튼만 활성화하는 함수"""
+    state = tk.DISABLED if busy else tk.NORMAL
+    for button in (btn_load_csv1, btn_load_csv2, btn_merge, btn_merge_multiple, btn_load_csv_anonymize,
+                   btn_anonymize, btn_batch_anonymize):
+        button.config(state=state)
+    btn_cancel.config(state=tk.NORMAL if busy else tk.DISABLED)
+    if busy:
+        progress_bar.config(value=0, maximum=1)
+
+
+# 명령줄(headless) 실행
+def parse_method_spec(spec):
+    """'컬럼=방법' 형식의 문자열을 (컬럼, 방법)으로 나누는 함수"""
+    column, sep, method = spec.partition('=')
+    if not sep or not column or method not in ANONYMIZATION_METHODS:
+        raise argparse.ArgumentTypeError(
+            f"invalid method spec {spec!r}; expected COLUMN=METHOD with METHOD one of: "
+            + ", ".join(ANONYMIZATION_METHODS))
+    return column, method
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="CSV Merger and Anonymizer (headless mode)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    merge_parser = subparsers.add_parser('merge', help="merge two or more CSV files on a key column")
+    merge_parser.add_argument('inputs', nargs='+', metavar='csv', help="files to merge (two or more)")
+    merge_parser.add_argument('-k', '--key', required=True, help="key column for merging")
+    merge_parser.add_argument('-o', '--output', required=True)
+    merge_parser.add_argument('--how', choices=JOIN_TYPES, default='outer',
+                              help="join type (semi/anti: keep rows of the first file whose key is / is not in "
+                                   "the other files, without their columns; default: outer)")
+    merge_parser.add_argument('--sorted', action='store_true',
+                              help="inputs are already sorted by key: merge them in one streaming pass without "
+                                   "partitioning (out-of-core merges check this automatically when not given)")
+    merge_parser.add_argument('--out-of-core', action='store_true',
+                              help="partition inputs on disk by key hash and merge partition by partition "
+                                   "(automatic for inputs larger than the streaming threshold)")
+    merge_parser.add_argument('--partitions', type=int, help="number of on-disk partitions for --out-of-core")
+    merge_parser.add_argument('--force', action='store_true',
+                              help="merge even if the key analysis predicts more than "
+                                   f"{JOIN_FANOUT_WARNING}x the input rows")
+    merge_parser.add_argument('--analyze-only', action='store_true',
+                              help="print the key analysis (rows, duplicates, match rate) and exit without merging")
+    merge_parser.add_argument('--engine', choices=['auto', 'c', 'pyarrow'], default=CSV_ENGINE,
+                              help="CSV parser for in-memory merges (auto: pyarrow for large files)")
+
+    anonymize_parser = subparsers.add_parser('anonymize', help="anonymize columns of a CSV file")
+    anonymize_parser.add_argument('csv')
+    anonymize_parser.add_argument('-o', '--output', required=True)
+    anonymize_parser.add_argument('--incremental', action='store_true',
+                                  help="only anonymize rows that are new or changed since the last run with the same "
+                                       "output (the input is loaded into memory)")
+    anonymize_parser.add_argument('-k', '--key', help="column identifying each row between runs (for --incremental)")
+    anonymize_parser.add_argument('--state', metavar='PATH',
+                                  help=f"fingerprint store for --incremental (default: OUTPUT{STATE_SUFFIX})")
+
+    batch_parser = subparsers.add_parser('batch', help="anonymize every file in directories or glob patterns")
+    batch_parser.add_argument('inputs', nargs='+', help="directories (all CSV/Parquet/Feather files) or glob patterns")
+    batch_parser.add_argument('-o', '--output', metavar='DIR',
+                              help="directory for the results (default: next to each input)")
+    batch_parser.add_argument('--jobs', type=int, default=BATCH_JOBS,
+                              help=f"files processed at the same time (default: {BATCH_JOBS})")
+    batch_parser.add_argument('--suffix', default=BATCH_SUFFIX, help="added to each output file name")
+    batch_parser.add_argument('--manifest', help="summary JSON path (default: batch_manifest.json in the output "
+                                                 "directory, or the current directory)")
+
+    for subparser in (anonymize_parser, batch_parser):
+        subparser.add_argument('-m', '--method', action='append', default=[], type=parse_method_spec,
+                               metavar='COLUMN=METHOD', help="anonymization method for a column (repeatable)")
+        subparser.add_argument('--config', metavar='PROFILE',
+                               help="anonymization profile JSON (column -> method and parameters); "
+                                    "-m options are added on top of it")
+        subparser.add_argument('--save-config', metavar='PROFILE',
+                               help="save the effective column settings as a profile JSON")
+        subparser.add_argument('--chunksize', type=int, default=CHUNK_SIZE, help="rows per chunk")
+        subparser.add_argument('--workers', type=int, default=HASH_WORKERS,
+                               help="processes used for hashing (default: CPU count)")
+        subparser.add_argument('--secret-file',
+                               help=f"file containing the secret key for HMAC-SHA256 / BLAKE2b Keyed "
+                                    f"(default: ${HASH_SECRET_ENV})")
+        subparser.add_argument('--digest-size', type=int, default=DEFAULT_DIGEST_SIZE,
+                               help="length in bytes of hash output (SHA-256, HMAC-SHA256: 1-32, BLAKE2b: 1-64)")
+        subparser.add_argument('--digest-encoding', choices=list(DIGEST_ENCODINGS), default='hex',
+                               help="text form of hash output (raw: binary, parquet/feather output only)")
+    for subparser in (merge_parser, anonymize_parser, batch_parser):
+        subparser.add_argument('--profile', metavar='PATH',
+                               help="write per-stage timings to PATH (.jsonl: one record per line, "
+                                    "otherwise a Chrome/Perfetto trace JSON)")
+        subparser.add_argument('--format', choices=['csv', 'parquet', 'feather'],
+                               help="output format (default: from the output file extension)")
+        subparser.add_argument('--compression',
+                               help="compression for parquet/feather output, e.g. snappy, zstd, lz4 or none")
+    return parser
+
+
+def _check_join_report(report, args):
+    print(format_join_report(report, args.inputs))
+    if report['dangerous'] and not args.force and not args.analyze_only:
+        raise ValueError(f"merge stopped: {report['estimated_rows']:,} output rows expected "
+                         f"({report['fanout']:.0f}x the input); rerun with --force to merge anyway")
+
+
+def run_merge(args, timer):
+    if len(args.inputs) < 2:
+        raise ValueError("at least two files are needed for a merge")
+    total_bytes = sum(estimated_input_bytes(path) for path in args.inputs)
+    if args.out_of_core or total_bytes > STREAMING_THRESHOLD_BYTES or args.analyze_only:
+        # 파일을 메모리에 올리지 않고 key 컬럼만 읽어서 분석
+        with timer.stage('analyze') as record:
+            report = analyze_join(args.inputs, args.key, how=args.how)
+            record['rows'] = sum(info['rows'] for info in report['inputs'])
+        _check_join_report(report, args)
+        if args.analyze_only:
+            return 0
+        return merge_files(args.inputs, args.key, args.output, partitions=args.partitions,
+                           file_format=args.format, compression=args.compression, timer=timer,
+                           how=args.how, presorted=True if args.sorted else None)
+
+    frames = []
+    for i, path in enumerate(args.inputs):
+        # semi/anti는 두 번째 파일부터 key 컬럼만 읽는다
+        columns = [args.key] if i and args.how in ('semi', 'anti') else None
+        encoding = detect_input_encoding(path, timer)
+        with timer.stage('load') as record:
+            df = optimize_dtypes(read_table(path, columns=columns, engine=args.engine, encoding=encoding))
+            record['rows'] = len(df)
+        print(f"{path}: encoding {df.attrs['encoding']}, parser {df.attrs['engine']}, {format_memory_report(df)}")
+        if args.key not in df.columns:
+            raise ValueError(f"key column {args.key!r} not found in {path}")
+        frames.append(df)
+    with timer.stage('analyze', sum(len(df) for df in frames)):
+        report = analyze_join(frames, args.key, how=args.how)
+    _check_join_report(report, args)
+    with timer.stage('merge', sum(len(df) for df in frames)):
+        df_merged = merge_many(frames, args.key, args.how)
+    with timer.stage('save', len(df_merged)):
+        write_table(df_merged, args.output, 'utf-8-sig', args.format, args.compression)
+    return len(df_merged)
+
+
+def _anonymize_job(args, timer):
+    """anonymize/batch 명령의 인자에서 컬럼 설정과 작업 옵션을 만드는 함수"""
+    settings = load_profile(args.config) if args.config else {}
+    settings.update(args.method)
+    if not settings:
+        raise ValueError("no columns to anonymize; give -m COLUMN=METHOD or --config PROFILE")
+    if args.save_config:
+        save_profile(args.save_config, settings)
+    set_hash_workers(args.workers)
+    secret = None
+    if args.secret_file:
+        with open(args.secret_file, 'rb') as file:
+            secret = file.read().rstrip(b'\r\n')
+    if args.digest_size < DEFAULT_DIGEST_SIZE:
+        bound = digest_collision_probability(10 ** 9, args.digest_size)
+        print(f"digest size {args.digest_size} bytes: collision probability <= {bound:.1e} per 1e9 distinct values")
+    options = new_job_options(secret=secret, digest_size=args.digest_size, digest_encoding=args.digest_encoding,
+                              timer=timer)
+    return settings, options
+
+
+def run_anonymize(args, timer):
+    settings, options = _anonymize_job(args, timer)
+    if args.incremental:
+        if not args.key:
+            raise ValueError("--incremental needs --key COLUMN to match rows between runs")
+        summary = anonymize_incremental(args.csv, args.output, args.key, settings, state_path=args.state,
+                                        options=options, file_format=args.format, compression=args.compression)
+        print(format_incremental_summary(summary))
+        return summary['rows']
+    # Parquet/Feather 입력에는 인코딩이 없다
+    encoding = detect_input_encoding(args.csv, timer)
+    if encoding is not None:
+        print(f"{args.csv}: encoding {encoding}")
+    return anonymize_csv_file(args.csv, args.output, settings, chunksize=args.chunksize, encoding=encoding,
+                              file_format=args.format, compression=args.compression, options=options)
+
+
+def run_batch(args, timer):
+    settings, options = _anonymize_job(args, timer)
+    files = expand_inputs(args.inputs, args.suffix)
+    if not files:
+        raise ValueError(f"no input files found in {args.inputs}")
+    print(f"{len(files)} files, {min(args.jobs, len(files))} at a time")
+
+    def progress(done, total):
+        print(f"[{done}/{total}] files done", flush=True)
+
+    with timer.stage('batch') as record:
+        entries = anonymize_batch(files, settings, args.output, options, jobs=args.jobs, chunksize=args.chunksize,
+                                  file_format=args.format, compression=args.compression, suffix=args.suffix,
+                                  progress=progress)
+        manifest_path = args.manifest or os.path.join(args.output or '.', 'batch_manifest.json')
+        manifest = write_manifest(manifest_path, entries, settings)
+        record['rows'] = manifest['total']['rows']
+    for entry in entries:
+        if entry['status'] == 'ok':
+            print(f"{entry['input']} -> {entry['output']}: {entry['rows']} rows in {entry['seconds']:.2f}s")
+        else:
+            print(f"{entry['input']}: FAILED ({entry['error']})", file=sys.stderr)
+    print(f"manifest written to {manifest_path}")
+    if manifest['total']['failed']:
+        raise ValueError(f"{manifest['total']['failed']} of {len(files)} files failed (see {manifest_path})")
+    return manifest['total']['rows']
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    commands = {'merge': run_merge, 'anonymize': run_anonymize, 'batch': run_batch}
+    timer = StageTimer()
+    start = time.perf_counter()
+    try:
+        rows = commands[args.command](args, timer)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+    print(timer.format_summary())
+    if args.profile:
+        timer.export(args.profile)
+        print(f"stage timings written to {args.profile}")
+    if getattr(args, 'analyze_only', False):
+        return 0
+    print(f"{args.command}: {rows} rows written to {args.output or 'the input directories'} in {elapsed:.2f}s "
+          f"({rows / elapsed if elapsed else 0:.0f} rows/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    # 인자가 있으면 GUI 없이 명령줄 모드로 실행
+    if len(sys.argv) > 1:
+        sys.exit(main())
+
+    # GUI 설정
+    window = tk.Tk()
+    window.title("CSV Merger and Anonymizer")
+    window.geometry("1000x600")
+    window.grid_rowconfigure(0, weight=1)
+    window.grid_columnconfigure(0, weight=1)
+
+    tab_parent = ttk.Notebook(window)
+    merge_tab = ttk.Frame(tab_parent)
+    anonymize_tab = ttk.Frame(tab_parent)
+    tab_parent.add(merge_tab, text="Merge CSVs")
+    tab_parent.add(anonymize_tab, text="Anonymize CSV")
+    # 진행 상황 표시줄
+    frame_status = tk.Frame(window)
+    frame_status.pack(side=tk.BOTTOM, fill=tk.X)
+
+    progress_bar = ttk.Progressbar(frame_status, orient=tk.HORIZONTAL, mode='determinate')
+    progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=10, pady=5)
+
+    status_label = tk.Label(frame_status, text="", width=24, anchor='w')
+    status_label.pack(side=tk.LEFT, padx=5)
+
+    btn_cancel = tk.Button(frame_status, text="Cancel", command=cancel_background_job, state=tk.DISABLED)
+    btn_cancel.pack(side=tk.LEFT, padx=10, pady=5)
+
+    tab_parent.pack(expand=1, fill='both')
+
+    # Merge CSV UI
+    frame_csv1 = tk.Frame(merge_tab)
+    frame_csv1.grid(row=0, column=0, padx=10, pady=10, sticky="nswe")
+    frame_csv1.grid_rowconfigure(1, weight=1)
+    frame_csv1.grid_columnconfigure(0, weight=1)
+
+    frame_csv2 = tk.Frame(merge_tab)
+    frame_csv2.grid(row=0, column=2, padx=10, pady=10, sticky="nswe")
+    frame_csv2.grid_rowconfigure(1, weight=1)
+    frame_csv2.grid_columnconfigure(0, weight=1)
+
+    label_csv1 = tk.Label(frame_csv1, text="CSV 1 Columns")
+    label_csv1.grid(row=0, column=0)
+
+    label_csv2 = tk.Label(frame_csv2, text="CSV 2 Columns")
+    label_csv2.grid(row=0, column=0)
+
+    listbox_csv1 = tk.Listbox(frame_csv1)
+    listbox_csv1.grid(row=1, column=0, sticky="nswe")
+
+    listbox_csv2 = tk.Listbox(frame_csv2)
+    listbox_csv2.grid(row=1, column=0, sticky="nswe")
 
+    scrollbar_csv1 = tk.Scrollbar(frame_csv1, orient=tk.VERTICAL, command=listbox_csv1.yview)
+    scrollbar_csv1.grid(row=1, column=1, sticky="ns")
+    listbox_csv1.configure(yscrollcommand=scrollbar_csv1.set)
 
-# GUI 설정
-window = tk.Tk()
-window.title("CSV Merger and Anonymizer")
-window.geometry("1000x600")
-window.grid_rowconfigure(0, weight=1)
-window.grid_columnconfigure(0, weight=1)
+    scrollbar_csv2 = tk.Scrollbar(frame_csv2, orient=tk.VERTICAL, command=listbox_csv2.yview)
+    scrollbar_csv2.grid(row=1, column=1, sticky="ns")
+    listbox_csv2.configure(yscrollcommand=scrollbar_csv2.set)
 
-tab_parent = ttk.Notebook(window)
-merge_tab = ttk.Frame(tab_parent)
-anonymize_tab = ttk.Frame(tab_parent)
-tab_parent.add(merge_tab, text="Merge CSVs")
-tab_parent.add(anonymize_tab, text="Anonymize CSV")
-tab_parent.pack(expand=1, fill='both')
+    btn_load_csv1 = tk.Button(merge_tab, text="Load CSV 1", command=load_csv_1)
+    btn_load_csv1.grid(row=1, column=0, padx=10, pady=5)
 
-# Merge CSV UI
-frame_csv1 = tk.Frame(merge_tab)
-frame_csv1.grid(row=0, column=0, padx=10, pady=10, sticky="nswe")
-frame_csv1.grid_rowconfigure(1, weight=1)
-frame_csv1.grid_columnconfigure(0, weight=1)
+    btn_load_csv2 = tk.Button(merge_tab, text="Load CSV 2", command=load_csv_2)
+    btn_load_csv2.grid(row=1, column=2, padx=10, pady=5)
 
-frame_csv2 = tk.Frame(merge_tab)
-frame_csv2.grid(row=0, column=2, padx=10, pady=10, sticky="nswe")
-frame_csv2.grid_rowconfigure(1, weight=1)
-frame_csv2.grid_columnconfigure(0, weight=1)
+    key_menu_label = tk.Label(merge_tab, text="Select Key Column:")
+    key_menu_label.grid(row=2, column=0, columnspan=3)
 
-label_csv1 = tk.Label(frame_csv1, text="CSV 1 Columns")
-label_csv1.grid(row=0, column=0)
+    key_menu = ttk.Combobox(merge_tab, state="readonly")
+    key_menu.grid(row=3, column=0, columnspan=3)
 
-label_csv2 = tk.Label(frame_csv2, text="CSV 2 Columns")
-label_csv2.grid(row=0, column=0)
+    how_menu_label = tk.Label(merge_tab, text="Join Type:")
+    how_menu_label.grid(row=4, column=0, columnspan=3)
 
-listbox_csv1 = tk.Listbox(frame_csv1)
-listbox_csv1.grid(row=1, column=0, sticky="nswe")
+    how_menu = ttk.Combobox(merge_tab, state="readonly", values=JOIN_TYPES)
+    how_menu.set('outer')
+    how_menu.grid(row=5, column=0, columnspan=3)
 
-listbox_csv2 = tk.Listbox(frame_csv2)
-listbox_csv2.grid(row=1, column=0, sticky="nswe")
+    btn_merge = tk.Button(merge_tab, text="Merge CSVs", command=merge_csv)
+    btn_merge.grid(row=6, column=0, columnspan=3, pady=10)
 
-scrollbar_csv1 = tk.Scrollbar(frame_csv1, orient=tk.VERTICAL, command=listbox_csv1.yview)
-scrollbar_csv1.grid(row=1, column=1, sticky="ns")
-listbox_csv1.configure(yscrollcommand=scrollbar_csv1.set)
+    btn_merge_multiple = tk.Button(merge_tab, text="Merge Multiple Files...", command=merge_multiple_files)
+    btn_merge_multiple.grid(row=7, column=0, columnspan=3)
 
-scrollbar_csv2 = tk.Scrollbar(frame_csv2, orient=tk.VERTICAL, command=listbox_csv2.yview)
-scrollbar_csv2.grid(row=1, column=1, sticky="ns")
-listbox_csv2.configure(yscrollcommand=scrollbar_csv2.set)
+    # Anonymize CSV UI
+    frame_anonymize = tk.Frame(anonymize_tab)
+    frame_anonymize.pack(side=tk.TOP, fill=tk.X)
 
-btn_load_csv1 = tk.Button(merge_tab, text="Load CSV 1", command=load_csv_1)
-btn_load_csv1.grid(row=1, column=0, padx=10, pady=5)
+    btn_load_csv_anonymize = tk.Button(frame_anonymize, text="Load CSV to Anonymize", command=load_csv_for_anonymize)
+    btn_load_csv_anonymize.pack(side=tk.LEFT, padx=10, pady=10)
 
-btn_load_csv2 = tk.Button(merge_tab, text="Load CSV 2", command=load_csv_2)
-btn_load_csv2.grid(row=1, column=2, padx=10, pady=5)
+    tk.Label(frame_anonymize, text="Secret Key:").pack(side=tk.LEFT, padx=5)
+    secret_entry = tk.Entry(frame_anonymize, show="*")
+    secret_entry.pack(side=tk.LEFT, padx=5)
 
-key_menu_label = tk.Label(merge_tab, text="Select Key Column:")
-key_menu_label.grid(row=2, column=0, columnspan=3)
+    btn_load_profile = tk.Button(frame_anonymize, text="Load Profile", command=load_anonymization_profile)
+    btn_load_profile.pack(side=tk.LEFT, padx=5)
 
-key_menu = ttk.Combobox(merge_tab, state="readonly")
-key_menu.grid(row=3, column=0, columnspan=3)
+    btn_save_profile = tk.Button(frame_anonymize, text="Save Profile", command=save_anonymization_profile)
+    btn_save_profile.pack(side=tk.LEFT, padx=5)
 
-btn_merge = tk.Button(merge_tab, text="Merge CSVs", command=merge_csv)
-btn_merge.grid(row=4, column=0, columnspan=3, pady=10)
+    incremental_var = tk.BooleanVar(value=False)
+    check_incremental = tk.Checkbutton(frame_anonymize, text="Only changed rows", variable=incremental_var)
+    check_incremental.pack(side=tk.LEFT, padx=5)
 
-# Anonymize CSV UI
-frame_anonymize = tk.Frame(anonymize_tab)
-frame_anonymize.pack(side=tk.TOP, fill=tk.X)
+    column_editor = ColumnEditor(anonymize_tab, on_add=add_column_for_anonymization)
+    column_editor.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
 
-btn_load_csv_anonymize = tk.Button(frame_anonymize, text="Load CSV to Anonymize", command=load_csv_for_anonymize)
-btn_load_csv_anonymize.pack(side=tk.LEFT, padx=10, pady=10)
+    settings_listbox = tk.Listbox(anonymize_tab)
+    settings_listbox.pack(fill=tk.BOTH, expand=True)
 
-settings_listbox = tk.Listbox(anonymize_tab)
-settings_listbox.pack(fill=tk.BOTH, expand=True)
+    scrollbar_settings = tk.Scrollbar(anonymize_tab, orient=tk.VERTICAL, command=settings_listbox.yview)
+    scrollbar_settings.pack(side=tk.RIGHT, fill=tk.Y)
+    settings_listbox.configure(yscrollcommand=scrollbar_settings.set)
 
-scrollbar_settings = tk.Scrollbar(anonymize_tab, orient=tk.VERTICAL, command=settings_listbox.yview)
-scrollbar_settings.pack(side=tk.RIGHT, fill=tk.Y)
-settings_listbox.configure(yscrollcommand=scrollbar_settings.set)
+    btn_anonymize = tk.Button(anonymize_tab, text="Perform Anonymization", command=perform_anonymization)
+    btn_anonymize.pack(side=tk.BOTTOM, pady=10)
 
-btn_anonymize = tk.Button(anonymize_tab, text="Perform Anonymization", command=perform_anonymization)
-btn_anonymize.pack(side=tk.BOTTOM, pady=10)
+    btn_batch_anonymize = tk.Button(anonymize_tab, text="Batch Anonymize Folder", command=perform_batch_anonymization)
+    btn_batch_anonymize.pack(side=tk.BOTTOM)
 
-window.mainloop()
+    window.mainloop()
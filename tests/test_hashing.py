@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+
+import test5
+
+
+class RecordingPool:
+    """프로세스를 띄우지 않고 map에 넘어온 배치를 기록하는 가짜 풀"""
+
+    def __init__(self):
+        self.batches = []
+
+    def map(self, func, batches):
+        self.batches = list(batches)
+        return map(func, self.batches)
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = RecordingPool()
+    monkeypatch.setattr(test5, '_get_hash_pool', lambda: pool)
+    return pool
+
+
+@pytest.mark.parametrize('workers', [2, 4, 8, 16])
+def test_full_chunk_is_split_across_all_workers(pool, monkeypatch, workers):
+    monkeypatch.setattr(test5, 'HASH_WORKERS', workers)
+    series = pd.Series([f"C{i:09d}" for i in range(test5.CHUNK_SIZE)])
+    hashed = test5.sha256_text_column(series)
+    assert len(pool.batches) >= workers
+    monkeypatch.setattr(test5, 'HASH_WORKERS', 1)
+    assert hashed.equals(test5.sha256_text_column(series))
+
+
+@pytest.mark.parametrize('options', [
+    None,
+    {'digest_encoding': 'base64', 'digest_size': 16},
+    {'digest_encoding': 'base32', 'digest_size': 7},
+    {'digest_encoding': 'raw', 'digest_size': 8},
+])
+@pytest.mark.parametrize('series', [
+    pd.Series([f"고객{i % 30000}" for i in range(40000)] + [None, '']),
+    pd.Series(range(10 ** 9, 10 ** 9 + 30000)),
+    pd.Series(list(range(20000)) + [1, 1.0, True, 'x', None, -0.0] * 100, dtype=object),
+], ids=['str', 'int', 'mixed'])
+def test_pool_result_matches_single_process(pool, monkeypatch, series, options):
+    monkeypatch.setattr(test5, 'HASH_WORKERS', 4)
+    options = dict(options or {}, secret='k')
+    for column_func in (test5.sha256_text_column, test5.hmac_sha256_column, test5.blake2b_keyed_column):
+        hashed = column_func(series, options)
+        assert pool.batches
+        monkeypatch.setattr(test5, 'HASH_WORKERS', 1)
+        expected = column_func(series, options)
+        monkeypatch.setattr(test5, 'HASH_WORKERS', 4)
+        assert hashed.equals(expected)
+        # 값 단위 함수와 같은 결과 (raw가 아닌 경우)
+        if column_func is test5.sha256_text_column and options.get('digest_encoding') is None:
+            assert list(hashed) == [test5.sha256_text(value) for value in series]
+
+
+def test_small_column_skips_pool(pool, monkeypatch):
+    monkeypatch.setattr(test5, 'HASH_WORKERS', 4)
+    test5.sha256_text_column(pd.Series(['a', 'b', 'a']))
+    assert pool.batches == []
@@ -0,0 +1,78 @@
+import pandas as pd
+import pytest
+
+import test5
+
+# 증분 비식별화 결과가 매번 처음부터 비식별화한 결과와 같은지 확인
+SETTINGS = {'고객번호': "SHA-256 Encrypt", '이름': "Replace with **", '주소': "Mask Address"}
+
+
+def customers(ids):
+    return pd.DataFrame({'고객번호': ids,
+                         '이름': [f"고객{i}" for i in ids],
+                         '주소': [f"서울특별시 {i}번길" for i in ids]})
+
+
+@pytest.fixture
+def run(tmp_path):
+    source = tmp_path / 'customers.csv'
+    output = tmp_path / 'anonymized.csv'
+    full = tmp_path / 'full.csv'
+
+    def run(df, settings=SETTINGS):
+        df.to_csv(source, index=False)
+        summary = test5.anonymize_incremental(str(source), str(output), '고객번호', settings)
+        test5.write_table(test5.anonymize_dataframe(test5.read_table(str(source)), settings), str(full))
+        assert output.read_bytes() == full.read_bytes()
+        return summary
+
+    return run
+
+
+def test_first_run_is_full(run):
+    assert run(customers([1, 2, 3, 4]))['mode'] == 'full'
+
+
+def test_unchanged_rerun(run):
+    run(customers([1, 2, 3, 4]))
+    summary = run(customers([1, 2, 3, 4]))
+    assert (summary['mode'], summary['unchanged']) == ('unchanged', 4)
+
+
+def test_new_rows_are_appended(run):
+    run(customers([1, 2, 3, 4]))
+    summary = run(customers([1, 2, 3, 4, 5, 6]))
+    assert (summary['mode'], summary['new'], summary['unchanged']) == ('appended', 2, 4)
+
+
+@pytest.mark.parametrize('ids', [[1, 2, 3], [1, 3, 4], [2, 3, 4]])
+def test_deleted_rows(run, ids):
+    run(customers([1, 2, 3, 4]))
+    summary = run(customers(ids))
+    assert (summary['mode'], summary['deleted'], summary['unchanged']) == ('rewritten', 1, 3)
+
+
+def test_deleted_and_appended_rows(run):
+    run(customers([1, 2, 3, 4]))
+    summary = run(customers([1, 2, 3, 5]))
+    assert (summary['mode'], summary['new'], summary['deleted']) == ('rewritten', 1, 1)
+
+
+def test_changed_rows(run):
+    run(customers([1, 2, 3, 4]))
+    df = customers([1, 2, 3, 4])
+    df.loc[2, '주소'] = '부산광역시 해운대구'
+    summary = run(df)
+    assert (summary['mode'], summary['changed'], summary['unchanged']) == ('rewritten', 1, 3)
+
+
+def test_settings_change_is_full(run):
+    run(customers([1, 2, 3, 4]))
+    assert run(customers([1, 2, 3, 4]), {**SETTINGS, '이름': "Replace with ***"})['mode'] == 'full'
+
+
+def test_dtype_change_is_full(run):
+    # int 0과 float 0.0은 해시가 같지만 str()은 '0'과 '0.0'으로 다르다
+    run(customers([0, 1, 2, 3]))
+    summary = run(customers([0.0, 1.0, 2.0, 3.5]))
+    assert summary['mode'] == 'full'
@@ -0,0 +1,43 @@
+import bz2
+import gzip
+import zipfile
+
+import pandas as pd
+
+import test5
+
+# 스트리밍 여부를 정할 때 압축/열 형식 입력은 풀린 크기로 판단하는지 확인
+TEXT = "a,b\n" + "1,2\n" * 200000
+
+
+def test_plain_csv_uses_file_size(tmp_path):
+    path = tmp_path / 'data.csv'
+    path.write_text(TEXT)
+    assert test5.estimated_input_bytes(str(path)) == len(TEXT)
+
+
+def test_gzip_uses_recorded_size(tmp_path):
+    path = tmp_path / 'data.csv.gz'
+    with gzip.open(path, 'wt') as file:
+        file.write(TEXT)
+    assert path.stat().st_size < len(TEXT) // 100
+    assert test5.estimated_input_bytes(str(path)) == len(TEXT)
+
+
+def test_zip_uses_listed_size(tmp_path):
+    path = tmp_path / 'data.zip'
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('data.csv', TEXT)
+    assert test5.estimated_input_bytes(str(path)) == len(TEXT)
+
+
+def test_unknown_size_is_overestimated(tmp_path):
+    path = tmp_path / 'data.csv.bz2'
+    path.write_bytes(bz2.compress(TEXT.encode()))
+    assert test5.estimated_input_bytes(str(path)) == path.stat().st_size * test5.COMPRESSION_RATIO_ESTIMATE
+
+
+def test_columnar_input_is_overestimated(tmp_path):
+    path = tmp_path / 'data.parquet'
+    pd.DataFrame({'a': ['같은 값'] * 100000}).to_parquet(path)
+    assert test5.estimated_input_bytes(str(path)) == path.stat().st_size * test5.COMPRESSION_RATIO_ESTIMATE
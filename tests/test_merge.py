@@ -0,0 +1,81 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import test5
+
+# 정렬 병합(메모리/스트리밍)과 semi/anti가 해시 병합(pd.merge, merge_many)과 같은 결과를 내는지 확인
+HOWS = ['outer', 'inner', 'left', 'right']
+
+
+def sorted_frame(rng, rows, column, nan=False):
+    # 키 범위를 행 수의 1/3로 잡아 중복 키가 청크 경계를 넘어가도록 한다
+    keys = np.sort(rng.integers(0, rows // 3, rows)).astype(float)
+    if nan:
+        keys[rng.integers(0, rows, 5)] = np.nan
+    df = pd.DataFrame({'k': keys, column: rng.integers(0, 100, rows)})
+    return df if nan else df.astype({'k': 'int64'})
+
+
+def canonical(df):
+    return df.sort_values(list(df.columns), kind='stable').reset_index(drop=True).to_csv(index=False)
+
+
+@pytest.mark.parametrize('how', HOWS)
+@pytest.mark.parametrize('dtypes', [('int64', 'int64'), ('float64', 'float64'), ('int64', 'float64'),
+                                    ('float64', 'int64')])
+def test_sorted_merge_matches_pd_merge(how, dtypes):
+    left = pd.DataFrame({'k': [1, 2, 2, 3, 5], 'a': range(5), 'x': list('abcde')}).astype({'k': dtypes[0]})
+    right = pd.DataFrame({'k': [0, 2, 2, 3, 6], 'b': range(5), 'x': list('vwxyz')}).astype({'k': dtypes[1]})
+    merged = test5.merge_dataframes(left, right, 'k', how)
+    expected = pd.merge(left, right, how=how, on='k')
+    assert merged.to_csv(index=False) == expected.to_csv(index=False)
+    assert merged.dtypes.equals(expected.dtypes)
+
+
+@pytest.mark.parametrize('how', ['semi', 'anti'])
+def test_semi_anti_keep_only_first_input(how):
+    left = pd.DataFrame({'k': [1, 2, 2, 3, None], 'a': range(5)})
+    right = pd.DataFrame({'k': [2, 3, 3, 4], 'b': range(4)})
+    third = pd.DataFrame({'k': [3, 5], 'c': range(2)})
+    matched = left['k'].isin([2, 3])
+    expected = left[matched if how == 'semi' else ~matched].reset_index(drop=True)
+    assert test5.merge_dataframes(left, right, 'k', how).equals(expected)
+    # 세 개 이상이면 차례로 적용한다: semi는 모든 입력에 키가 있는 행, anti는 어느 입력에도 키가 없는 행
+    expected = left[left['k'].isin([3]) if how == 'semi' else ~left['k'].isin([2, 3, 4, 5])].reset_index(drop=True)
+    assert test5.merge_many([left, right, third], 'k', how).equals(expected)
+
+
+@pytest.mark.parametrize('how', test5.JOIN_TYPES)
+@pytest.mark.parametrize('chunksize', [7, 1000])
+@pytest.mark.parametrize('nan', [False, True])
+@pytest.mark.parametrize('presorted', [True, False])
+def test_streamed_merge_matches_merge_many(tmp_path, how, chunksize, nan, presorted):
+    rng = np.random.default_rng(0)
+    frames = [sorted_frame(rng, 300, 'a', nan), sorted_frame(rng, 200, 'b', nan), sorted_frame(rng, 250, 'a', nan)]
+    paths = []
+    for i, frame in enumerate(frames):
+        paths.append(str(tmp_path / f'input{i}.csv'))
+        frame.to_csv(paths[-1], index=False)
+    output = tmp_path / 'merged.csv'
+    test5.merge_files(paths, 'k', str(output), chunksize=chunksize, how=how, presorted=presorted or None,
+                      partitions=None if presorted else 3)
+
+    expected = test5.merge_many([test5.read_table(path) for path in paths], 'k', how)
+    merged = pd.read_csv(output)
+    if presorted and not nan:
+        # 결측 키가 없으면 정렬 병합은 행 순서까지 같다
+        assert output.read_text(encoding='utf-8-sig') == expected.to_csv(index=False)
+    else:
+        # 결측 키 행은 마지막에, 파티션 병합은 파티션 순서로 나오므로 행 집합만 비교
+        assert canonical(merged) == canonical(pd.read_csv(io.StringIO(expected.to_csv(index=False))))
+
+
+def test_streamed_merge_rejects_unsorted_input(tmp_path):
+    paths = [str(tmp_path / 'a.csv'), str(tmp_path / 'b.csv')]
+    pd.DataFrame({'k': [1, 2, 3, 2], 'a': range(4)}).to_csv(paths[0], index=False)
+    pd.DataFrame({'k': [1, 2], 'b': range(2)}).to_csv(paths[1], index=False)
+    with pytest.raises(ValueError, match='not sorted'):
+        test5.merge_files(paths, 'k', str(tmp_path / 'merged.csv'), chunksize=2, presorted=True)
@@ -0,0 +1,86 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import test5
+
+# 컬럼 단위 함수가 값 단위 함수를 Series.apply로 적용한 것과 같은 CSV를 만드는지 확인
+TODAY = pd.Timestamp('2024-06-15')
+
+NAMES = [None, np.nan, '김', '이서', '박지민', '남궁민수', '제갈공명님', 'Kim', 'Alexander', '']
+PHONES = [1012345678, 1098765432, 212345678, np.nan, 1000000000]
+DATES = ['1990-01-01', '2004-06-15', '2004-06-16', '1974-12-31', '1960-02-29', 'not a date', '', None, np.nan,
+         19900101, 20240615, '2000-01-01T00:00:00+09:00', '1985-05-05 10:00', '2010/03/01']
+ADDRESSES = ['서울특별시 강남구 테헤란로 1', '부산광역시', None, np.nan, ' 앞공백', '제주특별자치도 제주시', '']
+AMOUNTS = [0, 1, 99.5, 100, 101, 123456.7, -50, np.nan]
+
+
+def to_csv(series):
+    return series.to_frame('value').to_csv(index=False)
+
+
+def assert_parity(column_func, scalar_func, values, dtype=None, options=None):
+    series = pd.Series(values, dtype=dtype, name='value')
+    expected = series.apply(scalar_func)
+    assert to_csv(column_func(series, options)) == to_csv(expected)
+
+
+@pytest.mark.parametrize('dtype', [object, None])
+def test_mask_name(dtype):
+    assert_parity(test5.mask_name_column, test5.mask_name, NAMES, dtype)
+
+
+@pytest.mark.parametrize('values', [NAMES, [12, 345, 6789, 12345], [1.5, np.nan, 22.25]])
+def test_sha256_text(values):
+    assert_parity(test5.sha256_text_column, test5.sha256_text, values, object)
+
+
+@pytest.mark.parametrize('dtype', ['int64', 'float64', object])
+def test_mask_phone(dtype):
+    values = [phone for phone in PHONES if dtype != 'int64' or not pd.isna(phone)]
+    assert_parity(test5.mask_phone_column, test5.mask_phone, values, dtype)
+
+
+def test_mask_phone_strings():
+    assert_parity(test5.mask_phone_column, test5.mask_phone, ['010-1234-5678', '01012345678', None], object)
+
+
+@pytest.mark.parametrize('values', [DATES, [19900101, 20040616, 20240615], ['2000-01-01T00:00:00+09:00',
+                                                                            '1999-12-31T23:00:00-05:00']])
+def test_categorize_age(values):
+    assert_parity(test5.categorize_age_column, lambda value: test5.categorize_age(value, TODAY), values, object,
+                  {'today': TODAY})
+
+
+@pytest.mark.parametrize('dtype', [object, None])
+def test_mask_address(dtype):
+    assert_parity(test5.mask_address_column, test5.mask_address, ADDRESSES, dtype)
+
+
+@pytest.mark.parametrize('column_func, scalar_func', [
+    (test5.round_up_square_footage_column, test5.round_up_square_footage),
+    (test5.round_up_monthly_payment_column, test5.round_up_monthly_payment),
+])
+@pytest.mark.parametrize('dtype', ['float64', None])
+def test_round_up(column_func, scalar_func, dtype):
+    assert_parity(column_func, scalar_func, AMOUNTS, dtype)
+
+
+def test_round_up_integers():
+    assert_parity(test5.round_up_monthly_payment_column, test5.round_up_monthly_payment, [0, 1, 100000, 250001],
+                  'int64')
+
+
+def test_anonymize_dataframe_matches_scalar_functions():
+    df = pd.read_csv(io.StringIO("이름,전화번호,생년월일,주소\n김철수,1012345678,1990-01-01,서울특별시 강남구\n"
+                                 "이서,,잘못된날짜,부산광역시\n,1098765432,,\n"))
+    settings = {'이름': "Replace with **", '전화번호': "Mask Phone", '생년월일': "Categorize Age", '주소': "Mask Address"}
+    anonymized = test5.anonymize_dataframe(df, settings, {'today': TODAY})
+    expected = df.copy()
+    expected['이름'] = df['이름'].apply(test5.mask_name)
+    expected['전화번호'] = df['전화번호'].apply(test5.mask_phone)
+    expected['생년월일'] = df['생년월일'].apply(lambda value: test5.categorize_age(value, TODAY))
+    expected['주소'] = df['주소'].apply(test5.mask_address)
+    assert anonymized.to_csv(index=False) == expected.to_csv(index=False)
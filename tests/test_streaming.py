@@ -0,0 +1,92 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import test5
+
+# 청크 단위 비식별화 결과가 파일 전체를 메모리에서 비식별화한 결과와 바이트 단위로 같은지 확인
+# (청크마다 추론되는 dtype이 달라도 _scan_dtypes/_common_dtype이 전체 기준 dtype으로 맞춰야 한다)
+ROWS = 40
+SETTINGS = {
+    '이름': "Replace with **",
+    '고객번호': "SHA-256 Encrypt",
+    '전화번호': "Mask Phone",
+    '생년월일': "Categorize Age",
+    '주소': "Mask Address",
+    '면적': "Round Up Square Footage",
+    '월납입금': "Round Up Monthly Payment",
+    '혼합': "HMAC-SHA256",
+}
+
+
+def column(values, overrides):
+    values = list(values)
+    for index, value in overrides.items():
+        values[index] = value
+    return values
+
+
+def mixed_csv():
+    """앞 청크와 뒤 청크에서 pandas가 추론하는 dtype이 달라지는 컬럼을 모은 CSV"""
+    columns = {
+        '이름': column((f"고객{i}" for i in range(ROWS)), {5: '', 30: '김'}),
+        # 정수였다가 뒤에서 빈 값이 나오면 float64
+        '고객번호': column((str(1000 + i) for i in range(ROWS)), {33: ''}),
+        '전화번호': column((f"010{12345678 + i}" for i in range(ROWS)), {2: '', 37: ''}),
+        '생년월일': column((f"19{50 + i}-0{1 + i % 9}-15" for i in range(ROWS)), {10: '', 25: 'unknown'}),
+        '주소': column(("서울특별시 강남구" for _ in range(ROWS)), {4: '', 20: '부산광역시'}),
+        # 정수, 소수, 빈 값이 청크마다 섞인다
+        '면적': column((str(i * 7) for i in range(ROWS)), {11: '12.5', 35: ''}),
+        '월납입금': column((str(i * 1000) for i in range(ROWS)), {0: '', 39: '1234.5'}),
+        # 정수였다가 문자열이 나오는 컬럼 (0으로 시작하는 값이 앞 청크에서 숫자로 읽히면 안 된다)
+        '혼합': column((str(i) for i in range(ROWS)), {3: '007', 28: 'A-1', 36: ''}),
+        # 변환하지 않는 컬럼: 앞쪽이 전부 비어 있다가 정수, 소수, 문자열이 나온다
+        '비고': column(('' for _ in range(ROWS)), {15: '3', 22: '4.25', 38: '메모'}),
+        '빈값': ['' for _ in range(ROWS)],
+        '정수': [str(i) for i in range(ROWS)],
+    }
+    header = ','.join(columns)
+    rows = (','.join(values) for values in zip(*columns.values()))
+    return '\n'.join([header, *rows]) + '\n'
+
+
+@pytest.mark.parametrize('chunksize', [1, 3, 7, 16, ROWS, 1000])
+def test_streamed_output_matches_in_memory(tmp_path, chunksize):
+    source = tmp_path / 'source.csv'
+    source.write_text(mixed_csv(), encoding='utf-8')
+    options = test5.new_job_options(secret='streaming test')
+    streamed, whole = tmp_path / 'streamed.csv', tmp_path / 'whole.csv'
+
+    assert test5.anonymize_csv_file(str(source), str(streamed), SETTINGS, chunksize=chunksize,
+                                    options=options) == ROWS
+    test5.write_table(test5.anonymize_dataframe(test5.read_table(str(source)), SETTINGS, options), str(whole))
+    assert streamed.read_bytes() == whole.read_bytes()
+
+
+@pytest.mark.parametrize('chunksize', [1, 7, 1000])
+def test_streamed_parquet_matches_in_memory(tmp_path, chunksize):
+    pq = pytest.importorskip('pyarrow.parquet')
+    source = tmp_path / 'source.csv'
+    source.write_text(mixed_csv(), encoding='utf-8')
+    options = test5.new_job_options(secret='streaming test')
+    streamed, whole = tmp_path / 'streamed.parquet', tmp_path / 'whole.parquet'
+
+    test5.anonymize_csv_file(str(source), str(streamed), SETTINGS, chunksize=chunksize, options=options)
+    test5.write_table(test5.anonymize_dataframe(test5.read_table(str(source)), SETTINGS, options), str(whole))
+    # 청크마다 row group이 나뉘므로 파일 바이트 대신 스키마(pandas 메타데이터 포함)와 값을 비교
+    streamed_table, whole_table = pq.read_table(streamed), pq.read_table(whole)
+    assert streamed_table.schema.equals(whole_table.schema, check_metadata=True)
+    assert streamed_table.equals(whole_table)
+
+
+def test_common_dtype_matches_whole_file_read():
+    # 문자열 컬럼의 dtype은 pandas 버전마다 다르므로(str 또는 object) 직접 읽어서 구한다
+    text = pd.read_csv(io.StringIO('a\nx\n'))['a'].dtype
+    int64, float64 = np.dtype('int64'), np.dtype('float64')
+    assert test5._common_dtype([int64, int64]) == int64
+    assert test5._common_dtype([int64, float64, int64]) == float64
+    assert test5._common_dtype([int64, text]) == text
+    assert test5._common_dtype([float64, text, int64]) == text
+    assert test5._common_dtype([int64, np.dtype('bool')]) == object
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import test5
+
+# 나눠 쓴 결과가 한 번에 쓴 결과와 같고, 조각마다 취소를 확인하는지 확인
+FRAME = pd.DataFrame({'id': range(1000), 'name': [f"고객{i}" for i in range(1000)],
+                      'amount': [i / 3 if i % 7 else None for i in range(1000)]})
+
+
+@pytest.mark.parametrize('suffix', ['.csv', '.parquet', '.feather'])
+def test_chunked_write_matches_single_write(tmp_path, suffix):
+    whole, chunked = tmp_path / f'whole{suffix}', tmp_path / f'chunked{suffix}'
+    test5.write_table(FRAME, str(whole))
+    calls = []
+    test5.write_table(FRAME, str(chunked), progress=lambda done, total: calls.append((done, total)), chunksize=300)
+    assert calls == [(0, 1000), (300, 1000), (600, 1000), (900, 1000)]
+    if suffix == '.csv':
+        assert chunked.read_bytes() == whole.read_bytes()
+    else:
+        assert test5.read_table(str(chunked)).equals(test5.read_table(str(whole)))
+
+
+def test_cancel_stops_before_writing_rest(tmp_path):
+    path = tmp_path / 'out.csv'
+
+    def progress(done, total):
+        if done:
+            raise test5.OperationCancelled()
+
+    with pytest.raises(test5.OperationCancelled):
+        test5.write_table(FRAME, str(path), progress=progress, chunksize=300)
+    assert len(pd.read_csv(path)) == 300
+
+
+def test_empty_frame_still_writes_header(tmp_path):
+    path = tmp_path / 'out.csv'
+    test5.write_table(FRAME.head(0), str(path), progress=lambda done, total: None)
+    assert path.read_text(encoding='utf-8').strip() == 'id,name,amount'
+
+
+@pytest.mark.parametrize('suffix', ['.parquet', '.feather'])
+def test_object_column_missing_in_first_chunk(tmp_path, suffix):
+    # 첫 청크에서 결측만 있던 object 컬럼도 이후 청크의 문자열을 쓸 수 있어야 한다
+    path = tmp_path / f'out{suffix}'
+    chunks = [pd.DataFrame({'note': pd.Series([np.nan, np.nan], dtype=object)}),
+              pd.DataFrame({'note': pd.Series(['메모', 3], dtype=object)})]
+    with test5.TableWriter(str(path)) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    assert test5.read_table(str(path))['note'].tolist()[2:] == ['메모', '3']